@@ -0,0 +1,290 @@
+"""Offline benchmark: runs the live and file transcription paths over WAV fixtures, no mic or GPU needed.
+
+Every model is measured in its own process so that load time and peak memory are not skewed by
+models loaded before it. Results go to a JSON file, one record per model/chunk/mode combination:
+
+    rtf                 inference seconds per second of audio (below 1.0 keeps up with real time)
+    first_text_latency  seconds from the start of the audio until the first text would be shown
+    peak_rss_mb         peak resident memory of the worker process
+    load_seconds        time to load the model
+
+With --replay-speed the live path is also run end to end: the fixture is played through ReplaySource into
+a real AudioRecorder, adding capture-to-display latency percentiles and dropped samples to each record.
+
+With --profile the live and file paths decode with that entry of DECODING_PROFILES (live chunks with the
+app's per-chunk time budget) instead of Whisper's defaults.
+
+--check-vad skips the models and only checks that VAD chunking keeps up with the speech in every fixture
+(the fixture played through AudioRecorder(use_vad=True)); it exits non-zero on failure.
+
+Usage: python benchmark.py [--models tiny,base] [--chunks 5,10] [--wav talk.wav ...] [--replay-speed 1] [--profile Realtime] [--output results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+def write_synthetic_wav(path, seconds, seed=0):
+    """Speech-like fixture: voiced bursts of harmonics with a wandering pitch, separated by pauses."""
+    rng = np.random.default_rng(seed)
+    audio = rng.normal(0, 0.002, int(seconds * SAMPLE_RATE)).astype(np.float32)
+    pos = 0
+    while pos < len(audio):
+        length = int(rng.uniform(0.8, 3.0) * SAMPLE_RATE)
+        t = np.arange(min(length, len(audio) - pos)) / SAMPLE_RATE
+        pitch = rng.uniform(100, 220) * (1 + 0.1 * np.sin(2 * np.pi * rng.uniform(2, 5) * t))
+        phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+        burst = sum(np.sin(k * phase) / k for k in range(1, 6))
+        envelope = np.abs(np.sin(np.pi * t * rng.uniform(3, 6))) # Roughly syllable rate
+        audio[pos:pos + len(t)] += 0.1 * burst * envelope
+        pos += len(t) + int(rng.uniform(0.3, 1.2) * SAMPLE_RATE)
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes((np.clip(audio, -1, 1) * 32767).astype(np.int16).tobytes())
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError: # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def live_options(profile, chunk):
+    """transcribe_chunk keyword arguments for a profile name, budgeted like a live session."""
+    from local_transcriber import DECODING_PROFILES, DEFAULT_SETTINGS
+    if not profile: return {}
+    return {'profile': DECODING_PROFILES[profile], 'budget': DEFAULT_SETTINGS["live_budget_ratio"] * chunk.duration}
+
+def bench_live(model, audio, chunk_seconds, profile=None):
+    """Feeds fixed chunks through the live path on a simulated clock: chunk i is ready at (i+1)*chunk
+    seconds and waits for the previous one, exactly as process_queue would with a single consumer."""
+    from local_transcriber import AudioChunk, transcribe_chunk
+    step = int(chunk_seconds * SAMPLE_RATE)
+    clock = 0.0
+    busy = 0.0
+    first_text = None
+    prev_words = []
+    for start in range(0, len(audio), step):
+        chunk = AudioChunk(audio[start:start + step])
+        segments, prev_words, elapsed = transcribe_chunk(model, chunk, prev_words, **live_options(profile, chunk))
+        clock = max(clock, start / SAMPLE_RATE + chunk.duration) + elapsed
+        busy += elapsed
+        if segments and first_text is None:
+            first_text = clock
+    return busy, first_text
+
+def bench_replay(model, path, chunk_seconds, speed, profile=None):
+    """Plays the file through ReplaySource into a real AudioRecorder (ring, segmenter, queue), so capture
+    and queueing are measured too. At speed 1 the latencies are what a live session would see."""
+    from local_transcriber import AudioRecorder, ReplaySource, LatencyStats, transcribe_chunk
+    source = ReplaySource(path, speed)
+    recorder = AudioRecorder()
+    stats = LatencyStats()
+
+    def stop_at_end():
+        source.finished.wait()
+        recorder.stop()
+        recorder.audio_queue.put(None)
+    
+    started = time.monotonic()
+    recorder.start(None, chunk_seconds, source=source)
+    threading.Thread(target=stop_at_end, daemon=True).start()
+    busy = 0.0
+    first_text = None
+    prev_words = []
+    while True:
+        chunk = recorder.audio_queue.get()
+        if chunk is None: break
+        chunk.trace['dequeue'] = time.monotonic()
+        segments, prev_words, elapsed = transcribe_chunk(model, chunk, prev_words, **live_options(profile, chunk))
+        chunk.trace['ui_insert'] = time.monotonic()
+        stats.record(chunk.trace)
+        busy += elapsed
+        if segments and first_text is None:
+            first_text = chunk.trace['ui_insert'] - started
+    
+    end_to_end = stats.percentiles().get("end_to_end")
+    return busy, first_text, {
+        'speed': speed,
+        'end_to_end_p50': round(float(end_to_end[1]), 3) if end_to_end else None,
+        'end_to_end_p95': round(float(end_to_end[2]), 3) if end_to_end else None,
+        'dropped_samples': recorder.ring.dropped,
+    }
+
+def check_vad(path, chunk_seconds=10, min_coverage=0.8):
+    """Regression check: VAD chunks must cover most of a speech-filled fixture, all the way to its end.
+    Returns (ok, covered_seconds, audio_seconds, noise_floor)."""
+    from local_transcriber import AudioRecorder, ReplaySource
+    source = ReplaySource(path, speed=0)
+    recorder = AudioRecorder()
+
+    def stop_at_end():
+        source.finished.wait()
+        recorder.stop()
+        recorder.audio_queue.put(None)
+    
+    recorder.start(None, chunk_seconds, use_vad=True, source=source)
+    threading.Thread(target=stop_at_end, daemon=True).start()
+    covered = 0.0
+    while True:
+        chunk = recorder.audio_queue.get()
+        if chunk is None: break
+        covered += chunk.duration - chunk.overlap
+    audio_seconds = len(source.audio) / SAMPLE_RATE
+    return covered >= min_coverage * audio_seconds, covered, audio_seconds, recorder.vad.noise_rms
+
+def bench_file(model, path, profile=None):
+    from local_transcriber import StreamingDecoder, probe_duration, iter_window_segments, profile_options, DECODING_PROFILES
+    options = profile_options(DECODING_PROFILES[profile]) if profile else {}
+    total = probe_duration(path)
+    source = StreamingDecoder(path)
+    started = time.perf_counter()
+    first_text = None
+    try:
+        for _, batch in iter_window_segments(model, source, total, **options):
+            if batch and first_text is None:
+                first_text = time.perf_counter() - started
+    finally:
+        source.close()
+    return time.perf_counter() - started, first_text
+
+def run_worker(args):
+    """Child process: loads one model on the CPU and measures every fixture and chunk size with it."""
+    import torch
+    import whisper
+    from local_transcriber import load_audio_file
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    started = time.perf_counter()
+    model = whisper.load_model(args.worker, device="cpu")
+    load_seconds = time.perf_counter() - started
+
+    results = []
+    def record(fixture, mode, chunk, audio_seconds, busy, first_text, extra=None):
+        results.append({
+            'model': args.worker, 'fixture': os.path.basename(fixture), 'mode': mode, 'chunk': chunk,
+            'audio_seconds': round(audio_seconds, 2),
+            'rtf': round(busy / audio_seconds, 3) if audio_seconds else None,
+            'first_text_latency': round(first_text, 2) if first_text is not None else None,
+            'load_seconds': round(load_seconds, 2),
+            'profile': args.profile,
+            **(extra or {}),
+        })
+
+    for fixture in args.fixtures:
+        audio = load_audio_file(fixture)
+        audio_seconds = len(audio) / SAMPLE_RATE
+        for chunk in args.chunks:
+            record(fixture, "live", chunk, audio_seconds, *bench_live(model, audio, chunk, args.profile))
+            if args.replay_speed is not None:
+                record(fixture, "replay", chunk, audio_seconds, *bench_replay(model, fixture, chunk, args.replay_speed, args.profile))
+        if args.file_mode:
+            record(fixture, "file", None, audio_seconds, *bench_file(model, fixture, args.profile))
+
+    peak = peak_rss_mb()
+    for r in results:
+        r['peak_rss_mb'] = peak
+    with open(args.result_file, "w", encoding="utf-8") as f:
+        json.dump(results, f)
+
+def main():
+    from local_transcriber import APP_VERSION, MODEL_SIZES, CHUNK_OPTIONS, DECODING_PROFILES
+
+    parser = argparse.ArgumentParser(description="Benchmark live and file transcription on the CPU.")
+    parser.add_argument("--models", default=",".join(MODEL_SIZES), help="comma-separated model names")
+    parser.add_argument("--chunks", default=",".join(str(c) for c in CHUNK_OPTIONS.values()), help="comma-separated live chunk lengths in seconds")
+    parser.add_argument("--wav", nargs="*", default=[], help="recorded fixtures to include")
+    parser.add_argument("--synthetic-seconds", type=float, default=60, help="length of the synthetic fixture (0 to skip)")
+    parser.add_argument("--threads", type=int, default=0, help="torch CPU threads (0 = torch default)")
+    parser.add_argument("--replay-speed", type=float, help="also run the full recorder pipeline via replay at this speed (1 = real time, 0 = unpaced)")
+    parser.add_argument("--profile", choices=list(DECODING_PROFILES), help="decoding profile (default: Whisper's defaults)")
+    parser.add_argument("--check-vad", action="store_true", help="only check VAD chunking on the fixtures")
+    parser.add_argument("--no-file", dest="file_mode", action="store_false", help="skip the file-mode path")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--fixtures", nargs="*", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.chunks = [int(c) for c in args.chunks.split(",")]
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    if args.file_mode and not shutil.which("ffmpeg"):
+        print("ffmpeg not found: skipping file mode.", file=sys.stderr)
+        args.file_mode = False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = list(args.wav)
+        if args.synthetic_seconds > 0:
+            synthetic = os.path.join(tmp, "synthetic.wav")
+            write_synthetic_wav(synthetic, args.synthetic_seconds)
+            fixtures.append(synthetic)
+        if not fixtures:
+            parser.error("no fixtures: pass --wav or a non-zero --synthetic-seconds")
+
+        if args.check_vad:
+            failed = 0
+            for fixture in fixtures:
+                ok, covered, audio_seconds, floor = check_vad(fixture)
+                failed += not ok
+                print(f"{'ok' if ok else 'FAIL':<5} {os.path.basename(fixture)}: chunks cover {covered:.1f}s of {audio_seconds:.1f}s "
+                      f"(noise floor {floor:.4f})")
+            sys.exit(1 if failed else 0)
+
+        results = []
+        for name in args.models.split(","):
+            result_file = os.path.join(tmp, f"{name}.json")
+            cmd = [sys.executable, os.path.abspath(__file__), "--worker", name, "--result-file", result_file,
+                   "--chunks", ",".join(str(c) for c in args.chunks), "--threads", str(args.threads),
+                   "--fixtures", *fixtures]
+            if not args.file_mode: cmd.append("--no-file")
+            if args.replay_speed is not None: cmd += ["--replay-speed", str(args.replay_speed)]
+            if args.profile: cmd += ["--profile", args.profile]
+            print(f"Benchmarking {name}...", file=sys.stderr)
+            if subprocess.run(cmd).returncode != 0 or not os.path.exists(result_file):
+                print(f"  {name} failed, skipping.", file=sys.stderr)
+                continue
+            with open(result_file, encoding="utf-8") as f:
+                results.extend(json.load(f))
+
+    try:
+        import torch
+        torch_version = torch.__version__
+    except ImportError:
+        torch_version = None
+    report = {
+        'app_version': APP_VERSION,
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'machine': platform.machine(), 'processor': platform.processor(), 'cpus': os.cpu_count(),
+        'python': platform.python_version(), 'torch': torch_version, 'threads': args.threads or None,
+        'results': results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'model':<8} {'fixture':<20} {'mode':<6} {'chunk':>5} {'rtf':>7} {'first':>7} {'rss MB':>8} {'load s':>7}")
+    for r in results:
+        fmt = lambda v, spec: format(v, spec) if v is not None else "-"
+        print(f"{r['model']:<8} {r['fixture'][:20]:<20} {r['mode']:<6} {fmt(r['chunk'], '>5')} {fmt(r['rtf'], '>7.3f')} "
+              f"{fmt(r['first_text_latency'], '>7.2f')} {fmt(r['peak_rss_mb'], '>8.1f')} {r['load_seconds']:>7.2f}")
+    print(f"Saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
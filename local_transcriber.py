@@ -1,18 +1,30 @@
+import time
+_IMPORT_START = time.perf_counter() # Startup timing reference (see TranscriberApp.report_startup)
+
 import customtkinter as ctk
-import sounddevice as sd
+try:
+    import sounddevice as sd
+except OSError: # PortAudio missing (headless CI box): only replay sources work
+    sd = None
 import numpy as np
 import threading
 import queue
-import whisper
 import datetime
 import os
 import sys
 import logging
-import torch
 import subprocess
 import webbrowser
 import re
 import json
+import wave
+import gc
+import contextlib
+import hashlib
+import multiprocessing
+from collections import OrderedDict, namedtuple
+from types import SimpleNamespace
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from tkinter import messagebox, filedialog
 
 # Setup logging
@@ -44,93 +56,1879 @@ CHUNK_OPTIONS = {
 }
 REVERSE_CHUNK_MAP = {v: k for k, v in CHUNK_OPTIONS.items()}
 
-class StdErrRedirector:
-    """Captures stderr (tqdm progress bars) to update the GUI."""
-    def __init__(self, callback):
-        self.callback = callback
-        self.original_stderr = sys.stderr
+# Live overlap between consecutive chunks (Label -> Seconds)
+OVERLAP_OPTIONS = {
+    "Overlap: Off": 0,
+    "Overlap: 1s": 1,
+    "Overlap: 2s": 2,
+    "Overlap: 3s": 3
+}
+
+# Decoding profiles: Whisper decode settings traded off between speed and accuracy.
+# "Balanced" is what whisper.transcribe() does when called from Python (one sample per fallback
+# temperature; best_of=5 is only the CLI's default); live mode additionally caps retries with a time budget.
+DECODING_PROFILES = {
+    "Realtime": {"beam_size": None, "best_of": None, "temperature": (0.0,), "condition_on_previous_text": False},
+    "Balanced": {"beam_size": None, "best_of": None, "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0), "condition_on_previous_text": True},
+    "Archive": {"beam_size": 5, "best_of": 5, "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0), "condition_on_previous_text": True}
+}
+# transcribe()'s thresholds for retrying at a higher temperature
+FALLBACK_COMPRESSION_RATIO = 2.4
+FALLBACK_LOGPROB = -1.0
+NO_SPEECH_PROB = 0.6
+# Profile menus (Label -> DECODING_PROFILES name)
+LIVE_PROFILE_OPTIONS = {f"Live: {name}": name for name in DECODING_PROFILES}
+FILE_PROFILE_OPTIONS = {f"Files: {name}": name for name in DECODING_PROFILES}
+REVERSE_LIVE_PROFILE_MAP = {v: k for k, v in LIVE_PROFILE_OPTIONS.items()}
+REVERSE_FILE_PROFILE_MAP = {v: k for k, v in FILE_PROFILE_OPTIONS.items()}
+
+# Spoken language (Label -> Whisper code; None = detect and lock per session)
+LANGUAGE_OPTIONS = {
+    "Language: Auto": None,
+    "English": "en",
+    "Spanish": "es",
+    "French": "fr",
+    "German": "de",
+    "Italian": "it",
+    "Portuguese": "pt",
+    "Dutch": "nl",
+    "Polish": "pl",
+    "Russian": "ru",
+    "Ukrainian": "uk",
+    "Turkish": "tr",
+    "Arabic": "ar",
+    "Hindi": "hi",
+    "Chinese": "zh",
+    "Japanese": "ja",
+    "Korean": "ko"
+}
+REVERSE_LANGUAGE_MAP = {v: k for k, v in LANGUAGE_OPTIONS.items()}
+# Sizes with a faster English-only checkpoint ("small" -> "small.en")
+ENGLISH_MODELS = ("tiny", "base", "small", "medium")
+
+MEDIA_EXTENSIONS = (".wav", ".mp3", ".m4a", ".mp4", ".flac", ".ogg", ".mkv", ".mov")
+MEDIA_FILETYPES = [("Audio/Video Files", " ".join("*" + ext for ext in MEDIA_EXTENSIONS)), ("All Files", "*.*")]
+
+# File mode decodes and transcribes this many seconds at a time
+FILE_WINDOW_SECONDS = 60
+# Files shorter than this are not worth spinning up worker processes for
+PARALLEL_MIN_SECONDS = 600
+
+# Approximate memory per loaded model (MB), from Whisper's published requirements
+MODEL_MEMORY_MB = {
+    "tiny": 1000,
+    "base": 1000,
+    "small": 2000,
+    "medium": 5000,
+    "large": 10000
+}
+
+SETTINGS_FILE = os.path.join(os.getcwd(), ".transcriber_settings.json")
+HARDWARE_PROFILE_FILE = os.path.join(os.getcwd(), ".hardware_profile.json")
+DEFAULT_SETTINGS = {
+    "last_model": None,
+    "last_device": "Auto",
+    "max_loaded_models": 2,
+    "model_memory_budget_mb": 12000,
+    "model_idle_unload_minutes": 15, # 0 keeps models loaded until exit
+    "parallel_file_mode": True, # Split long files across worker processes when running on CPU
+    "parallel_file_workers": 0, # 0 = one worker per 4 cores
+    "transcript_cache_mb": 200,
+    "audio_cache_mb": 4096, # Decoded PCM costs ~230 MB per audio hour
+    "backlog_policy": "merge", # What live mode does when behind: "wait", "merge", "skip_silence" or "faster_model"
+    "max_backlog_seconds": 180, # Oldest queued audio is dropped beyond this
+    "target_latency_seconds": 12, # Auto-tune: chunk length + inference time to aim for in live mode
+    "call_seconds": {}, # Auto-tune: measured seconds per Whisper call, "device:model" -> average
+    "metrics_file": "latency_metrics.jsonl", # Per-chunk latency traces; empty string disables
+    "inference_process": True, # Run Whisper in a child process, away from the UI and audio threads
+    "batch_backlog": True, # When behind, decode several waiting chunks in one batched pass
+    "language": None, # Last language choice (Whisper code); None = detect
+    "english_models": True, # Use the ".en" checkpoints once the language is English
+    "live_profile": "Balanced", # Decoding profile for live sessions (see DECODING_PROFILES)
+    "file_profile": "Balanced", # ...and for files and batches
+    "live_budget_ratio": 0.8 # Live: no fallback retry that would push a chunk past this x its length
+}
 
-    def write(self, buf):
-        if self.original_stderr:
-            self.original_stderr.write(buf)
-        match = re.search(r'(\d+)%', buf)
+# Live backlog handling
+MERGE_MAX_SECONDS = 30 # Whisper's window: merging past this gains nothing
+BATCH_MAX_SECONDS = 30 # Batched decoding pads every chunk to Whisper's window, so longer ones go alone
+BATCH_MAX_CHUNKS = 8 # Backlogged chunks decoded together in one batch
+SKIP_SPEECH_SECONDS = 0.5 # When behind, chunks with less voiced audio than this are skipped
+
+# Relative cost of one Whisper call per model size (tiny = 1), to extrapolate from measured models
+MODEL_COST = {
+    "tiny": 1,
+    "base": 2,
+    "small": 5,
+    "medium": 12,
+    "large": 24
+}
+# Guess for one tiny-model call before anything has been measured on a device
+BASE_CALL_SECONDS = {"cpu": 1.0, "cuda": 0.1, "mps": 0.3}
+CPU_REFERENCE_GFLOPS = 100 # Matmul speed at which the CPU guess above holds (roughly)
+
+def load_settings():
+    settings = dict(DEFAULT_SETTINGS)
+    try:
+        if os.path.exists(SETTINGS_FILE):
+            with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
+                settings.update(json.load(f))
+    except Exception as e:
+        logging.error(f"Could not read settings: {e}")
+    return settings
+
+def save_settings(settings):
+    try:
+        with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
+            json.dump(settings, f, indent=2)
+    except Exception as e:
+        logging.error(f"Could not write settings: {e}")
+
+def resolve_device(proc_mode, hardware=None):
+    """Maps the Device combo choice to a torch device name. `hardware` is a probed HardwareProfile.data;
+    without it, "Auto" asks torch directly."""
+    if proc_mode == "GPU (CUDA)": 
+        return "cuda"
+    elif proc_mode == "GPU (MPS)": 
+        return "mps"
+    elif proc_mode == "Auto": 
+        if hardware:
+            return "cuda" if hardware.get("cuda") else "mps" if hardware.get("mps") else "cpu"
+        import torch
+        if torch.cuda.is_available():
+            return "cuda"
+        elif hasattr(torch.backends, "mps") and torch.backends.mps.is_available():
+            return "mps"
+    return "cpu"
+
+def download_model(name, progress=None):
+    """Fetches a Whisper checkpoint into whisper's own cache, reporting "download" progress;
+    whisper.load_model then finds it there. Names whisper has no URL for (local paths) are left to it."""
+    import whisper
+    import urllib.request
+    url = getattr(whisper, "_MODELS", {}).get(name)
+    if url is None: return
+    root = os.path.join(os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "whisper")
+    target = os.path.join(root, os.path.basename(url))
+    if os.path.isfile(target): return # whisper checks the checksum itself
+    os.makedirs(root, exist_ok=True)
+    expected = url.split("/")[-2]
+    digest = hashlib.sha256()
+    tmp = target + ".part"
+    with urllib.request.urlopen(url) as response, open(tmp, "wb") as f:
+        total = int(response.headers.get("Content-Length") or 0) or None
+        done = 0
+        for block in iter(lambda: response.read(1024 * 1024), b""):
+            f.write(block)
+            digest.update(block)
+            done += len(block)
+            if progress: progress("download", done, total, name)
+    if digest.hexdigest() != expected:
+        os.remove(tmp)
+        raise RuntimeError(f"Download of '{name}' is corrupt (checksum mismatch); please try again.")
+    os.replace(tmp, target)
+
+def nvidia_driver_version():
+    """Installed NVIDIA driver version, or None. Cheap: no CUDA initialisation."""
+    try:
+        with open("/proc/driver/nvidia/version") as f:
+            match = re.search(r"Kernel Module\s+(\S+)", f.read())
+            if match: return match.group(1)
+    except OSError:
+        pass
+    try:
+        out = subprocess.run(["nvidia-smi", "--query-gpu=driver_version", "--format=csv,noheader"],
+                             capture_output=True, text=True, timeout=10)
+        if out.returncode == 0 and out.stdout.strip():
+            return out.stdout.split()[0]
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return None
+
+def memory_mb():
+    """(total, available) physical RAM in MB; either may be None where the platform does not say."""
+    try:
+        with open("/proc/meminfo") as f:
+            info = {line.split(":")[0]: int(line.split()[1]) for line in f if ":" in line}
+        return info["MemTotal"] // 1024, info.get("MemAvailable", info["MemTotal"]) // 1024
+    except (OSError, KeyError, ValueError):
+        pass
+    if sys.platform == "win32":
+        import ctypes
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(status)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullTotalPhys // 2**20, status.ullAvailPhys // 2**20
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 2**20, None
+    except (AttributeError, ValueError, OSError):
+        return None, None
+
+def normalize_word(word):
+    return re.sub(r"[^\w']", "", word.lower())
+
+def merge_overlap(prev_words, text, max_words=12):
+    """Drops the start of `text` that repeats the end of the previous chunk (their audio overlapped).
+    Looks for the longest run of the previous chunk's last words near the start of the new text."""
+    words = text.split()
+    new_norm = [normalize_word(w) for w in words]
+    prev_norm = [normalize_word(w) for w in prev_words[-max_words:]]
+    for k in range(min(len(prev_norm), len(new_norm)), 0, -1):
+        tail = prev_norm[-k:]
+        # The overlap may open on a clipped word, so allow the match to start a little late
+        max_skip = min(2, len(new_norm) - k) if k > 1 else 0
+        for skip in range(max_skip + 1):
+            if new_norm[skip:skip + k] == tail:
+                return " ".join(words[skip + k:])
+    return text
+
+def drop_leading_words(segments, count):
+    """Removes the first `count` words from a list of (start, text) segments."""
+    result = []
+    for start, text in segments:
+        words = text.split()
+        if count >= len(words):
+            count -= len(words)
+            continue
+        result.append((start, " ".join(words[count:])))
+        count = 0
+    return result
+
+def probe_duration(filepath):
+    """Returns the media duration in seconds (parsed from ffmpeg's header dump), or None."""
+    try:
+        out = subprocess.run(["ffmpeg", "-nostdin", "-hide_banner", "-i", filepath],
+                             capture_output=True, text=True, errors="replace").stderr
+        match = re.search(r'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)', out)
         if match:
+            h, m, sec = match.groups()
+            return int(h) * 3600 + int(m) * 60 + float(sec)
+    except Exception as e:
+        logging.error(f"Duration probe failed: {e}")
+    return None
+
+def decode_window(filepath, offset, duration):
+    """Decodes [offset, offset + duration) seconds of a file to 16 kHz mono float32."""
+    cmd = ["ffmpeg", "-nostdin", "-loglevel", "error", "-ss", f"{offset:.3f}", "-t", f"{duration:.3f}",
+           "-i", filepath, "-vn", "-f", "s16le", "-ac", str(CHANNELS), "-ar", str(SAMPLE_RATE), "-"]
+    out = subprocess.run(cmd, capture_output=True, check=True).stdout
+    return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+
+def load_audio_file(filepath):
+    """Whole file as 16 kHz mono float32. Plain 16-bit WAVs are read directly, anything else through ffmpeg."""
+    try:
+        with wave.open(filepath, "rb") as wf:
+            if wf.getframerate() == SAMPLE_RATE and wf.getnchannels() == CHANNELS and wf.getsampwidth() == 2:
+                return np.frombuffer(wf.readframes(wf.getnframes()), np.int16).astype(np.float32) / 32768.0
+    except (wave.Error, EOFError):
+        pass
+    return decode_window(filepath, 0, probe_duration(filepath) or 24 * 3600)
+
+def find_silences(filepath, noise_db=-35, min_silence=0.5):
+    """Returns [(start, end)] silent stretches via ffmpeg's silencedetect (streams, constant memory)."""
+    cmd = ["ffmpeg", "-nostdin", "-hide_banner", "-i", filepath, "-vn",
+           "-af", f"silencedetect=noise={noise_db}dB:d={min_silence}", "-f", "null", "-"]
+    out = subprocess.run(cmd, capture_output=True, text=True, errors="replace").stderr
+    starts = [float(x) for x in re.findall(r'silence_start: (-?\d+(?:\.\d+)?)', out)]
+    ends = [float(x) for x in re.findall(r'silence_end: (\d+(?:\.\d+)?)', out)]
+    return list(zip(starts, ends))
+
+def plan_spans(total, silences, target):
+    """Splits [0, total) into spans of about `target` seconds, cutting in the middle of the nearest silence."""
+    mids = [(a + b) / 2 for a, b in silences]
+    cuts = []
+    pos = 0.0
+    while total - pos > target * 1.5:
+        ideal = pos + target
+        candidates = [m for m in mids if pos < m and abs(m - ideal) <= target / 2]
+        cut = min(candidates, key=lambda m: abs(m - ideal)) if candidates else ideal
+        cuts.append(cut)
+        pos = cut
+    bounds = [0.0] + cuts + [total]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+# --- Transcription core (shared by the app and benchmark.py) ---
+def english_checkpoint(name):
+    """The English-only variant of a model size, where Whisper has one."""
+    return f"{name}.en" if name in ENGLISH_MODELS else name
+
+def detect_language(model, audio):
+    """(language code, probability) from one encoder pass over the first 30 s of `audio`."""
+    if isinstance(model, RemoteModel):
+        return model.detect_language(audio)
+    if not model.is_multilingual:
+        return "en", 1.0
+    import whisper
+    n_mels = getattr(model.dims, "n_mels", 80)
+    mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(np.asarray(audio, dtype=np.float32)), n_mels)
+    _, probs = model.detect_language(mel.to(model.device))
+    language = max(probs, key=probs.get)
+    return language, float(probs[language])
+
+def profile_options(profile):
+    """transcribe() keyword arguments for a DECODING_PROFILES entry."""
+    return {key: profile[key] for key in ("beam_size", "best_of", "temperature", "condition_on_previous_text")}
+
+def needs_fallback(result):
+    """transcribe()'s own retry test, applied to a whole clip of up to 30 s."""
+    for seg in result.get("segments", []):
+        if seg.get("no_speech_prob", 0) > NO_SPEECH_PROB and seg.get("avg_logprob", 0) < FALLBACK_LOGPROB:
+            continue # Silence: transcribe() would not retry it either
+        if seg.get("compression_ratio", 0) > FALLBACK_COMPRESSION_RATIO or seg.get("avg_logprob", 0) < FALLBACK_LOGPROB:
+            return True
+    return False
+
+def transcribe_with_budget(model, audio, profile, budget=None, **options):
+    """Steps through the profile's temperature schedule one call at a time, as transcribe() does for a
+    clip of up to 30 s, but skips any retry that would not finish within `budget` seconds."""
+    options.update(profile_options(profile))
+    temperatures = options.pop("temperature")
+    started = time.perf_counter()
+    for i, temperature in enumerate(temperatures):
+        attempt = time.perf_counter()
+        result = model.transcribe(audio, temperature=temperature, **options)
+        if i == len(temperatures) - 1 or not needs_fallback(result): break
+        now = time.perf_counter()
+        if budget is not None and (now - started) + (now - attempt) > budget:
+            logging.info(f"Decode budget: no retry after {i + 1} attempt(s), {now - started:.1f}s of {budget:.1f}s used")
+            break
+    return result
+
+def transcribe_chunk(model, chunk, prev_words, lock=None, profile=None, budget=None, **options):
+    """Live path: transcribe one AudioChunk and reconcile its overlap with the previous text.
+    With a decoding profile, fallback retries stop at `budget` seconds. options go to model.transcribe (e.g. language).
+    Returns ([(offset_seconds, text), ...], new prev_words, inference seconds)."""
+    fp16 = (model.device.type == "cuda")
+    with lock or contextlib.nullcontext():
+        started = time.perf_counter()
+        chunk.trace['inference_start'] = time.monotonic()
+        if profile:
+            res = transcribe_with_budget(model, chunk.audio.flatten(), profile, budget, fp16=fp16, **options)
+        else:
+            res = model.transcribe(chunk.audio.flatten(), fp16=fp16, **options)
+        chunk.trace['inference_end'] = time.monotonic()
+        elapsed = time.perf_counter() - started
+    
+    segments, prev_words = reconcile_overlap(chunk, res.get("segments", []), prev_words)
+    return segments, prev_words, elapsed
+
+def transcribe_chunks(model, chunks, prev_words, lock=None, **options):
+    """Live path while catching up: several AudioChunks (each at most BATCH_MAX_SECONDS) in one batched
+    decode. Returns ([segments per chunk], new prev_words, inference seconds for the whole batch)."""
+    fp16 = (model.device.type == "cuda")
+    audios = [c.audio.flatten() for c in chunks]
+    with lock or contextlib.nullcontext():
+        started = time.perf_counter()
+        stamp = time.monotonic()
+        if isinstance(model, RemoteModel):
+            results = model.batch_decode(audios, fp16=fp16, **options)
+        else:
+            results = batch_decode(model, audios, fp16=fp16, **options)
+        elapsed = time.perf_counter() - started
+    end = time.monotonic()
+    
+    per_chunk = []
+    for chunk, res in zip(chunks, results):
+        chunk.trace['inference_start'] = stamp
+        chunk.trace['inference_end'] = end
+        segments, prev_words = reconcile_overlap(chunk, res["segments"], prev_words)
+        per_chunk.append(segments)
+    return per_chunk, prev_words, elapsed
+
+def reconcile_overlap(chunk, raw_segments, prev_words):
+    """[(offset_seconds, text), ...] for a chunk, minus words its overlap repeats; plus the new prev_words."""
+    segments = [(seg['start'], seg['text'].strip()) for seg in raw_segments if seg['text'].strip()]
+    if chunk.overlap and prev_words:
+        words = " ".join(text for _, text in segments).split()
+        merged = merge_overlap(prev_words, " ".join(words))
+        segments = drop_leading_words(segments, len(words) - len(merged.split()))
+    new_words = " ".join(text for _, text in segments).split()
+    prev_words = (prev_words + new_words)[-12:] if chunk.overlap else new_words[-12:]
+    return segments, prev_words
+
+def batch_decode(model, audios, fp16=False, **options):
+    """One padded mel batch through whisper.decode: a single encoder pass and batched greedy decoding,
+    without transcribe()'s temperature fallback. Clips must be at most BATCH_MAX_SECONDS.
+    Returns one {'text', 'segments', 'language'} per clip, shaped like transcribe()'s result."""
+    import torch, whisper
+    from whisper.audio import N_FRAMES
+    from whisper.tokenizer import get_tokenizer
+    n_mels = getattr(model.dims, "n_mels", 80)
+    mels = torch.stack([whisper.pad_or_trim(whisper.log_mel_spectrogram(torch.from_numpy(np.asarray(a, dtype=np.float32)), n_mels), N_FRAMES)
+                        for a in audios])
+    mels = mels.to(model.device).to(torch.float16 if fp16 else torch.float32)
+    results = whisper.decode(model, mels, whisper.DecodingOptions(fp16=fp16, without_timestamps=False, **options))
+    try:
+        tokenizer = get_tokenizer(model.is_multilingual, num_languages=model.num_languages)
+    except (TypeError, AttributeError): # Older whisper
+        tokenizer = get_tokenizer(model.is_multilingual)
+    
+    out = []
+    for res in results:
+        # Same silence test as transcribe(): likely no speech and no confident text
+        if res.no_speech_prob > NO_SPEECH_PROB and res.avg_logprob < FALLBACK_LOGPROB:
+            out.append({'text': "", 'segments': [], 'language': res.language})
+            continue
+        segments = []
+        start = None
+        text_tokens = []
+        for token in res.tokens:
+            if token >= tokenizer.timestamp_begin:
+                stamp = (token - tokenizer.timestamp_begin) * 0.02 # Timestamp tokens are 20 ms apart
+                if start is not None and text_tokens:
+                    segments.append({'start': start, 'end': stamp, 'text': tokenizer.decode(text_tokens)})
+                    text_tokens = []
+                start = stamp
+            elif token < tokenizer.eot:
+                text_tokens.append(token)
+        if text_tokens: # No closing timestamp
+            segments.append({'start': start or 0.0, 'end': None, 'text': tokenizer.decode(text_tokens)})
+        out.append({'text': res.text, 'segments': segments, 'language': res.language})
+    return out
+
+def iter_window_segments(model, source, total=None, lock=None, **options):
+    """File path: yields (processed_seconds, [(offset_seconds, text), ...]) per window of `source`.
+    options go to model.transcribe (e.g. language)."""
+    fp16 = (model.device.type == "cuda")
+    offset = 0.0
+    prompt = None
+    while total is None or offset < total:
+        audio = source.window(offset, FILE_WINDOW_SECONDS)
+        if len(audio) == 0: break
+        window_len = len(audio) / SAMPLE_RATE
+        is_last = len(audio) < FILE_WINDOW_SECONDS * SAMPLE_RATE or (total is not None and offset + window_len >= total)
+        
+        with lock or contextlib.nullcontext():
+            result = model.transcribe(audio, fp16=fp16, verbose=None, initial_prompt=prompt, **options)
+        segments = result.get("segments", [])
+        
+        # The last segment may be cut off by the window edge: drop it and resume from its start
+        advance = window_len
+        if not is_last and len(segments) > 1 and segments[-1]['start'] > 0:
+            advance = segments[-1]['start']
+            segments = segments[:-1]
+        
+        batch = []
+        for segment in segments:
+            text = segment["text"].strip()
+            if text:
+                batch.append((offset + segment['start'], text))
+        if batch:
+            prompt = " ".join(text for _, text in batch)[-200:] # Carry context into the next window
+        
+        offset += advance
+        yield offset, batch
+        if is_last: break
+
+# --- Parallel file worker (runs in child processes) ---
+_worker_model = None
+
+def _init_file_worker(model_name, threads, load_lock):
+    global _worker_model
+    import torch, whisper
+    torch.set_num_threads(threads)
+    with load_lock: # One at a time, so a first-use download is not raced
+        _worker_model = whisper.load_model(model_name, device="cpu")
+
+def _transcribe_span(filepath, start, end, pcm_path=None, options=None):
+    if pcm_path:
+        pcm = np.memmap(pcm_path, dtype=np.float32, mode="c")
+        audio = pcm[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)]
+    else:
+        audio = decode_window(filepath, start, end - start)
+    result = _worker_model.transcribe(audio, fp16=False, verbose=None, **(options or {}))
+    return [(seg['start'], seg['text'].strip()) for seg in result.get("segments", [])]
+
+# --- Inference server (runs in a child process) ---
+def _attach_shared_memory(name):
+    from multiprocessing import shared_memory
+    try:
+        return shared_memory.SharedMemory(name=name, track=False) # Python 3.13+: the parent owns it
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+def _inference_server_main(conn):
+    """Serves ("load" | "unload" | "transcribe" | "detect_language" | "batch_decode" | "stop", ...) requests
+    until the pipe closes. Every request gets exactly one ("ok", payload) or ("error", message) reply."""
+    import torch, whisper
+    models = {} # (name, device) -> model
+    shm = None
+
+    def model(name, device):
+        # Also the first request after a restart: the new child has nothing loaded yet
+        if (name, device) not in models:
+            models[(name, device)] = whisper.load_model(name, device=device)
+        return models[(name, device)]
+
+    def with_audio(name, device, shm_name, samples, fn):
+        """fn(model, audio) on a zero-copy view of the parent's shared buffer."""
+        nonlocal shm
+        if shm is None or shm.name != shm_name: # The parent regrew it
+            if shm is not None: shm.close()
+            shm = _attach_shared_memory(shm_name)
+        audio = np.ndarray((samples,), dtype=np.float32, buffer=shm.buf)
+        try:
+            return fn(model(name, device), audio)
+        finally:
+            del audio # The buffer cannot be closed while a view is alive
+
+    def split(flat, lengths):
+        bounds = np.cumsum([0] + lengths)
+        return [flat[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        op, args = request[0], request[1:]
+        if op == "stop":
+            break
+        try:
+            if op == "load":
+                model(*args)
+                conn.send(("ok", None))
+            elif op == "unload":
+                name, device = args
+                if models.pop((name, device), None) is not None:
+                    gc.collect()
+                    if device == "cuda": torch.cuda.empty_cache()
+                conn.send(("ok", None))
+            elif op == "transcribe":
+                name, device, shm_name, samples, options = args
+                result = with_audio(name, device, shm_name, samples, lambda m, audio: m.transcribe(audio, **options))
+                fields = ('start', 'end', 'text', 'avg_logprob', 'compression_ratio', 'no_speech_prob')
+                segments = [{k: seg[k] for k in fields if k in seg} for seg in result.get("segments", [])]
+                conn.send(("ok", {'text': result.get("text", ""), 'segments': segments, 'language': result.get("language")}))
+            elif op == "detect_language":
+                conn.send(("ok", with_audio(*args, detect_language)))
+            elif op == "batch_decode":
+                name, device, shm_name, samples, lengths, options = args
+                results = with_audio(name, device, shm_name, samples,
+                                     lambda m, flat: batch_decode(m, split(flat, lengths), **options))
+                conn.send(("ok", results))
+            else:
+                conn.send(("error", f"Unknown request '{op}'"))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+class DecodedAudio:
+    """16 kHz mono float32 PCM of a media file, stored in the audio cache and read as memmap slices.
+    On a first use the file is decoded in the background and reads wait until their window is ready."""
+    def __init__(self, pcm_path, filepath=None, progress=None, duration=None):
+        self.pcm_path = pcm_path
+        self.progress = progress # progress(stage, done, total, label) while decoding
+        self.duration = duration
+        self.available = 0 # Samples on disk so far
+        self.error = None
+        self.done = False
+        self.readers = 1 # Opened by AudioCache.open, released by close()
+        self.cond = threading.Condition()
+        if filepath is None:
+            self.available = os.path.getsize(pcm_path) // 4
+            self.done = True
+        else:
+            threading.Thread(target=self._decode, args=(filepath,), daemon=True).start()
+
+    def _decode(self, filepath):
+        cmd = ["ffmpeg", "-nostdin", "-loglevel", "error", "-i", filepath, "-vn",
+               "-f", "f32le", "-ac", str(CHANNELS), "-ar", str(SAMPLE_RATE), "-"]
+        written = 0
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            with open(self.pcm_path, "wb") as f:
+                for block in iter(lambda: proc.stdout.read(1024 * 1024), b""):
+                    f.write(block)
+                    f.flush()
+                    written += len(block)
+                    with self.cond:
+                        self.available = written // 4
+                        self.cond.notify_all()
+                    if self.progress:
+                        self.progress("decode", written / 4 / SAMPLE_RATE, self.duration, os.path.basename(filepath))
+            if proc.wait() != 0:
+                raise RuntimeError(f"ffmpeg exited with code {proc.returncode}")
+            open(self.pcm_path + ".done", "w").close()
+        except Exception as e:
+            logging.error(f"Decode of {filepath} failed: {e}")
+            self.error = e
+        finally:
+            with self.cond:
+                self.done = True
+                self.cond.notify_all()
+
+    def window(self, offset, duration):
+        """Samples for [offset, offset + duration) seconds: a view into the memmap, not a copy."""
+        start = int(offset * SAMPLE_RATE)
+        end = start + int(duration * SAMPLE_RATE)
+        with self.cond:
+            while self.available < end and not self.done:
+                self.cond.wait()
+            if self.error:
+                raise self.error
+            available = self.available
+        end = min(end, available)
+        if end <= start:
+            return np.zeros(0, dtype=np.float32)
+        # Copy-on-write keeps the view writable for torch without touching the file
+        return np.memmap(self.pcm_path, dtype=np.float32, mode="c", shape=(available,))[start:end]
+
+    def in_use(self):
+        """Still being written or read: the cache must neither evict nor re-decode it."""
+        with self.cond:
+            return not self.done or self.readers > 0
+
+    def close(self):
+        with self.cond:
+            self.readers -= 1 # The background decode keeps filling the cache
+
+class StreamingDecoder:
+    """Fallback when a file does not fit the audio cache: one ffmpeg process piping PCM.
+    Windows must move forward (re-reading the tail of the last window is fine), so only about
+    two windows of audio are ever held in memory, however long the input."""
+    def __init__(self, filepath):
+        cmd = ["ffmpeg", "-nostdin", "-loglevel", "error", "-i", filepath, "-vn",
+               "-f", "f32le", "-ac", str(CHANNELS), "-ar", str(SAMPLE_RATE), "-"]
+        self.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self.buffer = np.zeros(0, dtype=np.float32)
+        self.buffer_start = 0 # Sample index of buffer[0]
+        self.eof = False
+
+    def _read(self, samples):
+        raw = b"" if self.eof else self.proc.stdout.read(samples * 4)
+        if len(raw) < samples * 4:
+            self.eof = True
+        return np.frombuffer(raw[:len(raw) // 4 * 4], dtype=np.float32)
+
+    def window(self, offset, duration):
+        start = int(offset * SAMPLE_RATE)
+        end = start + int(duration * SAMPLE_RATE)
+        if start < self.buffer_start:
+            raise ValueError("StreamingDecoder cannot seek backwards")
+        
+        # Drop (or skip over) audio before the window
+        drop = start - self.buffer_start
+        if drop >= len(self.buffer):
+            skip = drop - len(self.buffer)
+            while skip > 0 and not self.eof:
+                skip -= len(self._read(min(skip, SAMPLE_RATE * 60)))
+            self.buffer = np.zeros(0, dtype=np.float32)
+        else:
+            self.buffer = self.buffer[drop:]
+        self.buffer_start = start
+        
+        missing = (end - start) - len(self.buffer)
+        if missing > 0:
+            # A fresh array, so the dropped head of the old buffer is freed
+            self.buffer = np.concatenate([self.buffer, self._read(missing)])
+        return self.buffer[:end - start]
+
+    def close(self):
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.stdout.close()
+        self.proc.wait()
+
+class AudioCache:
+    """Decoded PCM files keyed by source path, mtime and size; least recently used evicted past the cap."""
+    def __init__(self, directory, max_mb=4096):
+        self.directory = directory
+        self.max_bytes = max_mb * 1024 * 1024
+        self.lock = threading.Lock()
+        self.active = {} # PCM path -> DecodedAudio being decoded or read
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except Exception as e:
+            logging.error(f"Audio cache unavailable: {e}")
+
+    def _pcm_path(self, filepath):
+        st = os.stat(filepath)
+        key = hashlib.sha1(f"{os.path.abspath(filepath)}|{st.st_mtime_ns}|{st.st_size}".encode()).hexdigest()
+        return os.path.join(self.directory, key + ".f32")
+
+    def lookup(self, filepath):
+        """Path of a fully decoded copy, or None."""
+        pcm_path = self._pcm_path(filepath)
+        if os.path.exists(pcm_path + ".done"):
+            os.utime(pcm_path) # Mark as recently used
+            return pcm_path
+        return None
+
+    def open(self, filepath, duration=None, progress=None):
+        """Returns a DecodedAudio (cached, or decoding into the cache) or a StreamingDecoder fallback."""
+        try:
+            pcm_path = self._pcm_path(filepath)
+            with self.lock:
+                self.active = {path: audio for path, audio in self.active.items() if audio.in_use()}
+                audio = self.active.get(pcm_path)
+                if audio is not None and audio.error is None:
+                    # Share the running decode: a second writer would truncate the file under the first
+                    with audio.cond:
+                        audio.readers += 1
+                    return audio
+                if self.lookup(filepath):
+                    audio = DecodedAudio(pcm_path)
+                else:
+                    needed = int((duration or 0) * SAMPLE_RATE * 4)
+                    if not duration or needed > self.max_bytes:
+                        return StreamingDecoder(filepath)
+                    self._evict(needed)
+                    audio = DecodedAudio(pcm_path, filepath, progress, duration)
+                self.active[pcm_path] = audio
+                return audio
+        except Exception as e:
+            logging.error(f"Audio cache open failed: {e}")
+            return StreamingDecoder(filepath)
+
+    def _evict(self, needed):
+        """Caller holds self.lock. Files in self.active are never evicted."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".f32"):
+                st = os.stat(os.path.join(self.directory, name))
+                entries.append((st.st_mtime, st.st_size, name))
+        used = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if used + needed <= self.max_bytes: break
+            if os.path.join(self.directory, name) in self.active: continue
+            try:
+                path = os.path.join(self.directory, name)
+                if os.path.exists(path + ".done"): os.remove(path + ".done")
+                os.remove(path)
+                used -= size
+            except OSError as e:
+                logging.warning(f"Could not evict {name}: {e}") # Still mapped (Windows)
+
+class TranscriptCache:
+    """On-disk cache of whole-file transcription results, keyed by audio content + model + decode options.
+    Entries are JSON files; least recently used ones are evicted past the size cap."""
+    INDEX_LIMIT = 2000
+
+    def __init__(self, directory, max_mb=200):
+        self.directory = directory
+        self.max_bytes = max_mb * 1024 * 1024
+        self.index_file = os.path.join(directory, "index.json")
+        self.lock = threading.Lock()
+        self.index = {} # "path|mtime|size" -> content hash, so unchanged files are not re-hashed
+        try:
+            os.makedirs(directory, exist_ok=True)
+            if os.path.exists(self.index_file):
+                with open(self.index_file, "r", encoding="utf-8") as f:
+                    self.index = json.load(f)
+        except Exception as e:
+            logging.error(f"Transcript cache unavailable: {e}")
+
+    def content_hash(self, filepath):
+        st = os.stat(filepath)
+        stat_key = f"{os.path.abspath(filepath)}|{st.st_mtime_ns}|{st.st_size}"
+        with self.lock:
+            if stat_key in self.index:
+                return self.index[stat_key]
+        h = hashlib.sha256()
+        with open(filepath, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        with self.lock:
+            self.index[stat_key] = digest
+            while len(self.index) > self.INDEX_LIMIT:
+                self.index.pop(next(iter(self.index)))
+            self._write_json(self.index_file, self.index)
+        return digest
+
+    def key_for(self, filepath, model_name, params):
+        options = json.dumps(params, sort_keys=True)
+        return hashlib.sha256(f"{self.content_hash(filepath)}|{model_name}|{options}".encode()).hexdigest()
+
+    def get(self, key):
+        """Returns [(start_seconds, text), ...] or None."""
+        path = os.path.join(self.directory, key + ".json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                segments = [tuple(item) for item in json.load(f)]
+            os.utime(path) # Mark as recently used
+            return segments
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.error(f"Bad transcript cache entry {key}: {e}")
+            return None
+
+    def put(self, key, segments):
+        with self.lock:
+            self._write_json(os.path.join(self.directory, key + ".json"), segments)
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json") and name != "index.json":
+                st = os.stat(os.path.join(self.directory, name))
+                entries.append((st.st_mtime, st.st_size, name))
+        used = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if used <= self.max_bytes: break
+            os.remove(os.path.join(self.directory, name))
+            used -= size
+
+    @staticmethod
+    def _write_json(path, data):
+        try:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logging.error(f"Transcript cache write failed: {e}")
+
+class HardwareProfile:
+    """What this machine can run, probed once and kept in a JSON file.
+    Re-probed only when the torch or NVIDIA driver version changes (or the probe itself does)."""
+    VERSION = 1
+    MATMUL_SIZE = 512
+    MATMUL_SECONDS = 0.3
+
+    def __init__(self, path):
+        self.path = path
+        self.data = None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.data = data
+        except Exception:
+            pass
+
+    def refresh(self):
+        """Worker thread: returns the profile, probing again if the cached one is stale."""
+        import torch
+        driver = nvidia_driver_version()
+        if self.data and self.data.get("torch") == torch.__version__ and self.data.get("driver") == driver:
+            return self.data
+        logging.info(f"Probing hardware (torch {torch.__version__}, driver {driver})")
+        self.data = self.probe(torch, driver)
+        try:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, indent=2)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            logging.error(f"Could not write hardware profile: {e}")
+        return self.data
+
+    def probe(self, torch, driver):
+        cuda = torch.cuda.is_available()
+        total_mb, available_mb = memory_mb()
+        data = {
+            "version": self.VERSION, "probed": datetime.datetime.now().isoformat(timespec="seconds"),
+            "torch": torch.__version__, "driver": driver, "nvidia_gpu": driver is not None,
+            "cuda": cuda, "mps": hasattr(torch.backends, "mps") and torch.backends.mps.is_available(),
+            "gpu_name": None, "gpu_memory_mb": None,
+            "cpu_count": os.cpu_count(), "cpu_gflops": self.cpu_gflops(torch),
+            "ram_total_mb": total_mb, "ram_available_mb": available_mb,
+        }
+        if cuda:
+            props = torch.cuda.get_device_properties(0)
+            data["gpu_name"] = props.name
+            data["gpu_memory_mb"] = props.total_memory // 2**20
+        return data
+
+    def cpu_gflops(self, torch):
+        """float32 matmul throughput, the operation Whisper spends its CPU time in."""
+        n = self.MATMUL_SIZE
+        a = torch.randn(n, n)
+        b = torch.randn(n, n)
+        torch.matmul(a, b) # Warm-up
+        runs = 0
+        started = time.perf_counter()
+        while time.perf_counter() - started < self.MATMUL_SECONDS:
+            torch.matmul(a, b)
+            runs += 1
+        return round(2 * n ** 3 * runs / (time.perf_counter() - started) / 1e9, 1)
+
+    def base_call_seconds(self, device):
+        """Expected time of one tiny-model call on `device`, scaled by the measured CPU speed."""
+        base = BASE_CALL_SECONDS.get(device, 1.0)
+        if device == "cpu" and self.data and self.data.get("cpu_gflops"):
+            base *= CPU_REFERENCE_GFLOPS / self.data["cpu_gflops"]
+        return base
+
+    def recommended_model(self, target_latency):
+        """Largest model that should keep up live on the Auto device and fits in its memory."""
+        device = resolve_device("Auto", self.data)
+        controller = RealtimeController(device, {}, target_latency, base_call=self.base_call_seconds(device))
+        memory = self.data.get("gpu_memory_mb") if device == "cuda" else self.data.get("ram_total_mb")
+        model = "tiny"
+        for name in MODEL_SIZES:
+            if controller.best_chunk(name) is not None and (memory is None or MODEL_MEMORY_MB[name] <= memory * 0.8):
+                model = name
+        return model
+
+# stage is "download" (bytes), "load" (0 or 1), "decode" or "transcribe" (seconds of audio);
+# total is None when unknown; rate is done-units per second, smoothed
+ProgressEvent = namedtuple("ProgressEvent", "stage done total rate label")
+
+class ProgressBus:
+    """Progress events from worker threads, coalesced per stage and handed to subscribers on the UI thread
+    at most every MIN_INTERVAL seconds."""
+    MIN_INTERVAL = 0.1
+
+    def __init__(self, schedule):
+        self.schedule = schedule # schedule(delay_ms, fn) runs fn on the UI thread (Tk's after)
+        self.subscribers = []
+        self.latest = {} # stage -> newest undelivered ProgressEvent
+        self.rates = {} # stage -> (time, done, smoothed rate)
+        self.lock = threading.Lock()
+        self.scheduled = False
+        self.last_delivery = 0.0
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def publish(self, stage, done, total=None, label=None):
+        """Any thread. Cheap enough to call per block: delivery is batched."""
+        now = time.monotonic()
+        with self.lock:
+            rate = None
+            prev = self.rates.get(stage)
+            if prev and done >= prev[1]: # A smaller value means a new operation: start over
+                rate = prev[2]
+                if now > prev[0]:
+                    instant = (done - prev[1]) / (now - prev[0])
+                    rate = instant if rate is None else 0.7 * rate + 0.3 * instant
+            self.rates[stage] = (now, done, rate)
+            self.latest[stage] = ProgressEvent(stage, done, total, rate, label)
+            if self.scheduled: return
+            self.scheduled = True
+            delay = max(0.0, self.last_delivery + self.MIN_INTERVAL - now)
+        self.schedule(int(delay * 1000), self._deliver)
+
+    def _deliver(self):
+        with self.lock:
+            events = list(self.latest.values())
+            self.latest.clear()
+            self.scheduled = False
+            self.last_delivery = time.monotonic()
+        for callback in self.subscribers:
+            for event in events:
+                try:
+                    callback(event)
+                except Exception as e:
+                    logging.error(f"Progress subscriber failed: {e}")
+
+class BackupJournal:
+    """Append-only crash-recovery log: one JSON line per segment, written by a background thread."""
+    FSYNC_INTERVAL = 1.0 # Seconds between fsyncs (bounds loss on power failure)
+
+    def __init__(self, path):
+        self.path = path
+        self.queue = queue.Queue()
+        self.file = None
+        self.dirty = False
+        self.last_sync = time.monotonic()
+        self.thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def _encode(segment):
+        return json.dumps({'time': segment['time'].isoformat(), 'text': segment['text']}) + "\n"
+
+    def extend(self, segments):
+        """Queue many segments as a single write."""
+        if segments:
+            self.queue.put(("add", "".join(self._encode(s) for s in segments)))
+
+    def reset(self):
+        self.queue.put(("reset", None))
+
+    def compact(self, segments, supersedes=None):
+        """Atomically rewrite the log with exactly these segments, then delete `supersedes` if given."""
+        self.queue.put(("compact", ("".join(self._encode(s) for s in segments), supersedes)))
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join(timeout=5)
+
+    def replay(self):
+        """Returns (segments, needs_compact). Torn or unreadable records are skipped."""
+        segments = []
+        needs_compact = False
+        if not os.path.exists(self.path):
+            return segments, needs_compact
+        with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    # Crash mid-write: appending after this would corrupt the next record
+                    needs_compact = True
+                if not line.strip(): continue
+                try:
+                    item = json.loads(line)
+                    segments.append({'time': datetime.datetime.fromisoformat(item['time']), 'text': item['text']})
+                except (ValueError, KeyError, TypeError):
+                    logging.warning(f"Skipping torn backup record: {line[:80]!r}")
+                    needs_compact = True
+        return segments, needs_compact
+
+    def _writer_loop(self):
+        while True:
+            try:
+                op = self.queue.get(timeout=self.FSYNC_INTERVAL)
+            except queue.Empty:
+                self._sync()
+                continue
+            if op is None: break
+            kind, payload = op
+            try:
+                if kind == "add":
+                    if self.file is None:
+                        self.file = open(self.path, "a", encoding="utf-8")
+                    self.file.write(payload)
+                    self.dirty = True
+                elif kind == "reset":
+                    self._close_file()
+                    if os.path.exists(self.path): os.remove(self.path)
+                elif kind == "compact":
+                    content, supersedes = payload
+                    self._close_file()
+                    tmp_path = self.path + ".tmp"
+                    with open(tmp_path, "w", encoding="utf-8") as f:
+                        f.write(content)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, self.path)
+                    if supersedes and os.path.exists(supersedes): os.remove(supersedes)
+                # Batch fsyncs: only when the queue drains and the interval has passed
+                if self.queue.empty() and time.monotonic() - self.last_sync >= self.FSYNC_INTERVAL:
+                    self._sync()
+            except Exception as e:
+                logging.error(f"Backup journal {kind} failed: {e}")
+        self._sync()
+        self._close_file()
+
+    def _sync(self):
+        if self.file and self.dirty:
+            try:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+            except Exception as e:
+                logging.error(f"Backup journal sync failed: {e}")
+            self.dirty = False
+        self.last_sync = time.monotonic()
+
+    def _close_file(self):
+        if self.file:
+            self._sync()
+            self.file.close()
+            self.file = None
+
+class VoiceActivityDetector:
+    """Energy + zero-crossing speech detector, cheap enough to run on every capture block."""
+    FRAME = 480 # 30 ms at 16 kHz
+    MIN_RMS = 0.004 # Absolute floor so digital silence never counts as speech
+    NOISE_RATIO = 3.0 # Speech must be this much louder than the tracked noise floor
+    MAX_ZCR = 0.45 # Above this the frame is hiss/static rather than voice
+    FLOOR_FALL = 0.5 # Noise floor follows a quieter background quickly...
+    FLOOR_RISE = 0.02 # ...and a louder one slowly, so quiet speech cannot drag it up
+
+    def __init__(self):
+        self.noise_rms = self.MIN_RMS
+
+    def voiced_frames(self, block):
+        """Returns a bool per FRAME-sized frame of the block (trailing partial frame included)."""
+        block = block.reshape(-1)
+        n = max(1, -(-len(block) // self.FRAME))
+        padded = np.zeros(n * self.FRAME, dtype=np.float32)
+        padded[:len(block)] = block
+        frames = padded.reshape(n, self.FRAME)
+        
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        zcr = np.mean(np.abs(np.diff(np.signbit(frames), axis=1)), axis=1)
+        threshold = max(self.MIN_RMS, self.noise_rms * self.NOISE_RATIO)
+        voiced = (rms > threshold) & (zcr < self.MAX_ZCR)
+        
+        # Minimum tracker: the quietest frame is background, not quiet speech or fricatives.
+        # Rising slowly from every block also lets a steady hum above the floor stop counting as voice.
+        level = max(float(rms.min()), self.MIN_RMS / 2)
+        rate = self.FLOOR_FALL if level < self.noise_rms else self.FLOOR_RISE
+        self.noise_rms += rate * (level - self.noise_rms)
+        return voiced
+
+class AudioRingBuffer:
+    """Fixed-capacity float32 ring buffer for one producer (audio callback) and one consumer thread.
+    Positions are absolute sample counts; each side only ever writes its own counter, so no lock is needed."""
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.buffer = np.zeros(capacity, dtype=np.float32)
+        self.write_pos = 0 # Owned by the producer
+        self.read_pos = 0 # Owned by the consumer: everything before it may be overwritten
+        self.dropped = 0
+
+    def write(self, block):
+        """Producer side: a plain copy into preallocated memory. Returns False (and drops) when full."""
+        n = len(block)
+        if n > self.free():
+            self.dropped += n
+            return False
+        start = self.write_pos % self.capacity
+        first = min(n, self.capacity - start)
+        self.buffer[start:start + first] = block[:first]
+        if first < n:
+            self.buffer[:n - first] = block[first:]
+        self.write_pos += n # Publish only after the data is in place
+        return True
+
+    def views(self, start, end):
+        """Consumer side: zero-copy views covering [start, end), split in two if it wraps."""
+        n = end - start
+        offset = start % self.capacity
+        first = min(n, self.capacity - offset)
+        parts = [self.buffer[offset:offset + first]]
+        if first < n:
+            parts.append(self.buffer[:n - first])
+        return parts
+
+    def copy(self, start, end):
+        """Consumer side: an owned copy of [start, end), for data that outlives its ring slot."""
+        return np.concatenate(self.views(start, end))
+
+    def release(self, pos):
+        self.read_pos = pos
+
+    def free(self):
+        return self.capacity - (self.write_pos - self.read_pos)
+
+class InferenceCrashed(RuntimeError):
+    """The inference process died mid-request (crash or out of memory). The next request starts a new one."""
+
+class InferenceServer:
+    """Owns the Whisper models in a child process, so Python-side decoding never competes with the UI
+    and the audio callback for the GIL, and a crash or OOM there cannot take the session down.
+    Audio goes through shared memory; requests and segments through a pipe."""
+    def __init__(self):
+        self.ctx = multiprocessing.get_context("spawn") # Forking a process with torch threads is unsafe
+        self.process = None
+        self.conn = None
+        self.shm = None # Parent-owned audio buffer, regrown when a window does not fit
+        self.lock = threading.Lock() # One request in flight
+        self.on_crash = None # Called with the exit code when the child died
+        self.closed = False # Set by close(): no new child is started after it
+
+    def _start(self):
+        parent, child = self.ctx.Pipe()
+        self.process = self.ctx.Process(target=_inference_server_main, args=(child,), daemon=True,
+                                        name="inference-server")
+        self.process.start()
+        child.close()
+        self.conn = parent
+        logging.info(f"Inference server started (pid {self.process.pid})")
+
+    def _request(self, *message, audio=None):
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("Inference server is closed")
+            if self.process is None or not self.process.is_alive():
+                self._start()
+            if audio is not None:
+                message = message[:3] + (self._share(audio), len(audio)) + message[3:]
+            try:
+                self.conn.send(message)
+                status, payload = self.conn.recv()
+            except (EOFError, OSError) as e:
+                self.process.join(timeout=5)
+                code = self.process.exitcode
+                self.process = None
+                if self.closed:
+                    raise InferenceCrashed("Inference process stopped on close")
+                logging.error(f"Inference server died (exit code {code}): {e}")
+                if self.on_crash: self.on_crash(code)
+                raise InferenceCrashed(f"Inference process died (exit code {code})")
+        if status == "error":
+            raise RuntimeError(payload)
+        return payload
+
+    def _share(self, audio):
+        """Copies `audio` into the shared buffer; returns the buffer's name for the child to map."""
+        from multiprocessing import shared_memory
+        needed = len(audio) * 4
+        if self.shm is None or self.shm.size < needed:
+            if self.shm is not None:
+                self.shm.close()
+                self.shm.unlink()
+            # Room for the longest merged live chunk or file window, so regrowing stays rare
+            size = max(needed, (max(MERGE_MAX_SECONDS, FILE_WINDOW_SECONDS) + 5) * SAMPLE_RATE * 4)
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        np.ndarray((len(audio),), dtype=np.float32, buffer=self.shm.buf)[:] = audio
+        return self.shm.name
+
+    def load(self, name, device):
+        """ModelManager loader: loads in the child and returns a proxy for it."""
+        self._request("load", name, device)
+        return RemoteModel(self, name, device)
+
+    def unload(self, name, device):
+        if self.process is not None and self.process.is_alive():
+            self._request("unload", name, device)
+
+    def transcribe(self, name, device, audio, options):
+        return self._request("transcribe", name, device, options, audio=np.ascontiguousarray(audio, dtype=np.float32))
+
+    def detect_language(self, name, device, audio):
+        return self._request("detect_language", name, device, audio=np.ascontiguousarray(audio, dtype=np.float32))
+
+    def batch_decode(self, name, device, audios, options):
+        lengths = [len(a) for a in audios]
+        return self._request("batch_decode", name, device, lengths, options,
+                             audio=np.concatenate(audios).astype(np.float32, copy=False))
+
+    def close(self):
+        """UI thread, on exit: never waits for a load or decode in flight (that can take tens of seconds)."""
+        self.closed = True
+        idle = self.lock.acquire(blocking=False)
+        try:
+            process = self.process
+            if process is not None and process.is_alive():
+                if idle:
+                    try:
+                        self.conn.send(("stop",))
+                    except OSError:
+                        pass
+                    process.join(timeout=2)
+                if process.is_alive(): process.terminate()
+                process.join(timeout=2)
+                if process.is_alive(): process.kill()
+            # The shared buffer may still be in use by the request in flight; only release it when idle
+            if idle and self.shm is not None:
+                self.shm.close()
+                self.shm.unlink()
+                self.shm = None
+        finally:
+            if idle: self.lock.release()
+
+class RemoteModel:
+    """Stands in for a Whisper model living in the InferenceServer: same device and transcribe() surface."""
+    def __init__(self, server, name, device):
+        self.server = server
+        self.name = name
+        self.device = SimpleNamespace(type=device)
+
+    def transcribe(self, audio, **options):
+        return self.server.transcribe(self.name, self.device.type, audio, options)
+
+    def batch_decode(self, audios, **options):
+        return self.server.batch_decode(self.name, self.device.type, audios, options)
+
+    def detect_language(self, audio):
+        return self.server.detect_language(self.name, self.device.type, audio)
+
+    def close(self):
+        # Called under the ModelManager lock: do not wait behind a running transcription
+        threading.Thread(target=self.server.unload, args=(self.name, self.device.type), daemon=True).start()
+
+class ModelManager:
+    """Keeps several Whisper models loaded under a memory budget, evicting the least recently used."""
+    IDLE_CHECK_INTERVAL = 30 # Seconds
+
+    def __init__(self, max_models=2, memory_budget_mb=12000, idle_minutes=15, loader=None):
+        self.loader = loader # loader(name, device) -> model; default: whisper.load_model in this process
+        self.max_models = max_models
+        self.memory_budget_mb = memory_budget_mb
+        self.idle_minutes = idle_minutes
+        self.models = OrderedDict() # (name, device) -> model, least recently used first
+        self.refs = {} # (name, device) -> number of active users
+        self.last_used = {}
+        self.loading = {} # (name, device) -> Event set when that load finishes
+        self.lock = threading.Lock()
+        threading.Thread(target=self._idle_loop, daemon=True).start()
+
+    def acquire(self, name, device, on_load=None, progress=None):
+        """Returns a loaded model, loading it if needed. Pair with release().
+        progress(stage, done, total, label) receives "download" and "load" events."""
+        key = (name, device)
+        while True:
+            with self.lock:
+                if key in self.models:
+                    self.models.move_to_end(key)
+                    self.refs[key] = self.refs.get(key, 0) + 1
+                    self.last_used[key] = time.monotonic()
+                    return self.models[key]
+                event = self.loading.get(key)
+                if event is None:
+                    event = self.loading[key] = threading.Event()
+                    # Free memory *before* loading so a swap never holds both models
+                    self._evict_for(name)
+                    break
+            event.wait() # Someone else (e.g. the warm loader) is loading it
+        
+        try:
+            if on_load: on_load()
+            download_model(name, progress)
+            logging.info(f"Loading model '{name}' on {device}")
+            if progress: progress("load", 0, 1, name)
+            if self.loader:
+                model = self.loader(name, device)
+            else:
+                import whisper
+                model = whisper.load_model(name, device=device)
+            if progress: progress("load", 1, 1, name)
+            with self.lock:
+                self.models[key] = model
+                self.refs[key] = self.refs.get(key, 0) + 1
+                self.last_used[key] = time.monotonic()
+            return model
+        finally:
+            with self.lock:
+                del self.loading[key]
+            event.set()
+
+    def peek(self, name, device):
+        """Like acquire(), but only if the model is already loaded. Returns None otherwise."""
+        key = (name, device)
+        with self.lock:
+            if key not in self.models: return None
+            self.models.move_to_end(key)
+            self.refs[key] = self.refs.get(key, 0) + 1
+            self.last_used[key] = time.monotonic()
+            return self.models[key]
+
+    def release(self, name, device):
+        key = (name, device)
+        with self.lock:
+            if self.refs.get(key, 0) > 0:
+                self.refs[key] -= 1
+            self.last_used[key] = time.monotonic()
+
+    def preload(self, name, device, progress=None):
+        """Warm-load in the background without holding a reference."""
+        def load():
             try:
-                self.callback(int(match.group(1)) / 100.0)
-            except: pass
+                self.acquire(name, device, progress=progress)
+                self.release(name, device)
+            except Exception as e:
+                logging.error(f"Preload of '{name}' failed: {e}")
+        threading.Thread(target=load, daemon=True).start()
+
+    def _evict_for(self, name):
+        """Evicts idle models (LRU first) until `name` fits. Caller holds the lock."""
+        def over_budget():
+            # ".en" checkpoints are the same size as the multilingual ones
+            used = sum(MODEL_MEMORY_MB.get(n.split(".")[0], 0) for n, _ in self.models)
+            return (len(self.models) >= self.max_models
+                    or used + MODEL_MEMORY_MB.get(name.split(".")[0], 0) > self.memory_budget_mb)
+        for key in list(self.models):
+            if not over_budget(): break
+            if self.refs.get(key, 0) == 0:
+                self._unload(key)
+        if over_budget():
+            logging.warning(f"Loading '{name}' over the model budget: all loaded models are in use")
+
+    def _unload(self, key):
+        logging.info(f"Unloading model '{key[0]}' from {key[1]}")
+        close = getattr(self.models.pop(key), "close", None)
+        if close: close()
+        self.refs.pop(key, None)
+        self.last_used.pop(key, None)
+        gc.collect()
+        if key[1] == "cuda":
+            import torch
+            torch.cuda.empty_cache()
+
+    def _idle_loop(self):
+        while True:
+            time.sleep(self.IDLE_CHECK_INTERVAL)
+            if not self.idle_minutes: continue
+            cutoff = time.monotonic() - self.idle_minutes * 60
+            with self.lock:
+                for key in list(self.models):
+                    if self.refs.get(key, 0) == 0 and self.last_used.get(key, 0) < cutoff:
+                        self._unload(key)
+
+class RealtimeController:
+    """Picks model size and chunk length from measured inference time.
+    Whisper pads every call to 30 s, so a call costs about the same for any chunk length:
+    RTF ~ call_seconds / chunk and latency ~ chunk + call_seconds."""
+    HEADROOM = 0.8 # Live RTF must stay below this
+    STEP_UP_AFTER = 5 # Comfortable chunks in a row before trying a bigger model
+
+    def __init__(self, device, profile, target_latency, base_call=None):
+        self.device = device
+        self.profile = profile # Shared with settings["call_seconds"], so measurements persist
+        self.target_latency = target_latency
+        self.base_call = base_call # Prior for an unmeasured device (HardwareProfile.base_call_seconds)
+        self.comfortable = 0
+
+    def call_seconds(self, model):
+        key = f"{self.device}:{model}"
+        if key in self.profile:
+            return self.profile[key]
+        # Extrapolate from the closest-sized model already measured on this device
+        measured = [m for m in MODEL_SIZES if f"{self.device}:{m}" in self.profile]
+        if measured:
+            other = min(measured, key=lambda m: abs(MODEL_COST[m] - MODEL_COST[model]))
+            return self.profile[f"{self.device}:{other}"] * MODEL_COST[model] / MODEL_COST[other]
+        return (self.base_call or BASE_CALL_SECONDS.get(self.device, 1.0)) * MODEL_COST[model]
+
+    def record(self, model, audio_seconds, elapsed):
+        """Adds one measured call; returns its real-time factor."""
+        key = f"{self.device}:{model}"
+        prev = self.profile.get(key)
+        self.profile[key] = elapsed if prev is None else 0.7 * prev + 0.3 * elapsed
+        return elapsed / max(audio_seconds, 0.1)
+
+    def best_chunk(self, model):
+        """Shortest chunk that keeps `model` faster than real time and within the latency target, or None."""
+        call = self.call_seconds(model)
+        for chunk in sorted(CHUNK_OPTIONS.values()):
+            if call / chunk <= self.HEADROOM and chunk + call <= self.target_latency:
+                return chunk
+        return None
+
+    def initial_plan(self):
+        """Largest model expected to keep up, with its chunk length."""
+        plan = ("tiny", max(CHUNK_OPTIONS.values()))
+        for model in MODEL_SIZES:
+            chunk = self.best_chunk(model)
+            if chunk is not None:
+                plan = (model, chunk)
+        return plan
+
+    def plan_live(self, model):
+        """Next (model, chunk) after a measurement. Steps down at once, up only after a calm streak."""
+        names = list(MODEL_SIZES)
+        idx = names.index(model)
+        chunk = self.best_chunk(model)
+        if chunk is None:
+            self.comfortable = 0
+            if idx > 0:
+                smaller = names[idx - 1]
+                return smaller, self.best_chunk(smaller) or max(CHUNK_OPTIONS.values())
+            return model, max(CHUNK_OPTIONS.values()) # Nothing smaller: longest chunk is the best RTF
+        self.comfortable += 1
+        if self.comfortable >= self.STEP_UP_AFTER and idx < len(names) - 1:
+            self.comfortable = 0
+            bigger_chunk = self.best_chunk(names[idx + 1])
+            if bigger_chunk is not None:
+                return names[idx + 1], bigger_chunk
+        return model, chunk
+
+    def plan_file(self, duration, deadline):
+        """Largest model whose estimated time for the whole file fits the deadline (seconds)."""
+        best = "tiny"
+        for model in MODEL_SIZES:
+            if duration / 30 * self.call_seconds(model) <= deadline:
+                best = model
+        return best
+
+class LanguageLock:
+    """Session language: detected on the first confidently voiced chunks, then passed to every call
+    so Whisper skips its per-chunk detection (and cannot flip language mid-sentence)."""
+    MIN_SPEECH = 2.0 # Voiced seconds a chunk needs before its detection counts
+    MIN_PROB = 0.8 # Detections less sure than this are ignored
+    VOTES = 2 # Agreeing detections in a row needed to lock
+    SURE_PROB = 0.97 # ...unless one is at least this sure
+
+    def __init__(self, language=None):
+        self.language = language # Set = locked (a manual choice locks from the start)
+        self.manual = language is not None
+        self.votes = []
+
+    def observe(self, language, prob):
+        """Adds one detection; returns True if it locked the language."""
+        if self.language or prob < self.MIN_PROB: return False
+        self.votes = (self.votes + [language])[-self.VOTES:]
+        if prob >= self.SURE_PROB or (len(self.votes) == self.VOTES and len(set(self.votes)) == 1):
+            self.language = language
+            return True
+        return False
+
+class LatencyStats:
+    """Per-stage latency of live chunks: rolling percentiles plus a JSON-lines log of every trace."""
+    # Stage name -> (from, to) trace stamps
+    STAGES = {
+        "capture": ("capture_start", "capture_end"),
+        "segment": ("capture_end", "enqueue"),
+        "queue": ("enqueue", "dequeue"),
+        "prepare": ("dequeue", "inference_start"),
+        "inference": ("inference_start", "inference_end"),
+        "display": ("inference_end", "ui_insert"),
+        "end_to_end": ("capture_end", "ui_insert")
+    }
+    WINDOW = 500 # Most recent chunks kept per stage
+
+    def __init__(self, metrics_path=None):
+        self.metrics_path = metrics_path
+        self.samples = {stage: [] for stage in self.STAGES}
+        self.lock = threading.Lock()
+
+    def record(self, trace):
+        durations = {}
+        for stage, (start, end) in self.STAGES.items():
+            if trace.get(start) is not None and trace.get(end) is not None:
+                durations[stage] = trace[end] - trace[start]
+        with self.lock:
+            for stage, value in durations.items():
+                values = self.samples[stage]
+                values.append(value)
+                if len(values) > self.WINDOW: del values[0]
+            if self.metrics_path:
+                try:
+                    with open(self.metrics_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps({'time': datetime.datetime.now().isoformat(),
+                                            'stages': {k: round(v, 4) for k, v in durations.items()}}) + "\n")
+                except Exception as e:
+                    logging.error(f"Could not write metrics: {e}")
+
+    def percentiles(self):
+        """stage -> (count, p50, p95, p99) in seconds."""
+        result = {}
+        with self.lock:
+            for stage, values in self.samples.items():
+                if values:
+                    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+                    result[stage] = (len(values), p50, p95, p99)
+        return result
+
+class DiagnosticsWindow(ctk.CTkToplevel):
+    """Live view of LatencyStats."""
+    REFRESH_MS = 1000
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.app = app
+        self.title("Diagnostics")
+        self.geometry("560x300")
+        self.text = ctk.CTkTextbox(self, font=("Consolas", 13))
+        self.text.pack(fill="both", expand=True, padx=10, pady=10)
+        self.refresh()
+
+    def refresh(self):
+        if not self.winfo_exists(): return
+        lines = [f"{'Stage':<12}{'Count':>7}{'p50':>10}{'p95':>10}{'p99':>10}", "-" * 49]
+        stats = self.app.latency_stats.percentiles()
+        for stage in LatencyStats.STAGES:
+            if stage in stats:
+                count, p50, p95, p99 = stats[stage]
+                lines.append(f"{stage:<12}{count:>7}{p50:>9.2f}s{p95:>9.2f}s{p99:>9.2f}s")
+        if len(lines) == 2:
+            lines.append("No live chunks yet. Start a recording.")
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", "\n".join(lines))
+        self.text.configure(state="disabled")
+        self.after(self.REFRESH_MS, self.refresh)
+
+class AudioChunk:
+    """A captured chunk on its way to transcription."""
+    def __init__(self, audio, overlap=0.0, speech=None, trace=None, capture_time=None):
+        self.audio = audio
+        self.overlap = overlap # Leading seconds that repeat the end of the previous chunk
+        self.speech = speech # Voiced seconds, if the VAD has seen it
+        self.trace = trace if trace is not None else {} # Stage name -> time.monotonic() stamp
+        self.capture_time = capture_time # Wall-clock datetime of the first sample
+        self.parts = [] # (offset_seconds, capture_time) where a merged chunk jumps across a capture gap
+
+    @property
+    def duration(self):
+        return len(self.audio) / SAMPLE_RATE
+
+    def time_at(self, offset):
+        """Wall-clock datetime of the sample `offset` seconds into the chunk (None if not known)."""
+        start, base = 0.0, self.capture_time
+        for part_offset, part_time in self.parts:
+            if part_offset > offset: break
+            start, base = part_offset, part_time
+        return base + datetime.timedelta(seconds=offset - start) if base else None
+
+    def speech_seconds(self):
+        if self.speech is None:
+            voiced = VoiceActivityDetector().voiced_frames(self.audio)
+            self.speech = int(voiced.sum()) * VoiceActivityDetector.FRAME / SAMPLE_RATE
+        return self.speech
+
+    @staticmethod
+    def merge(chunks):
+        """One chunk covering consecutive chunks, without their repeated overlap audio.
+        VAD chunks are not contiguous (trimmed pre-roll, dropped silence), so each part keeps its capture time."""
+        audio = []
+        parts = []
+        offset = 0.0
+        for i, c in enumerate(chunks):
+            trim = int(c.overlap * SAMPLE_RATE) if i else 0
+            if i and c.capture_time:
+                parts.append((offset, c.time_at(trim / SAMPLE_RATE)))
+            parts.extend((offset + o - trim / SAMPLE_RATE, t) for o, t in c.parts if o * SAMPLE_RATE > trim)
+            audio.append(c.audio[trim:])
+            offset += (len(c.audio) - trim) / SAMPLE_RATE
+        trace = dict(chunks[0].trace)
+        for stamp in ("capture_end", "enqueue", "dequeue"):
+            if stamp in chunks[-1].trace: trace[stamp] = chunks[-1].trace[stamp]
+        merged = AudioChunk(np.concatenate(audio), overlap=chunks[0].overlap, trace=trace,
+                            capture_time=chunks[0].capture_time)
+        merged.parts = parts
+        return merged
+
+class MicrophoneSource:
+    """Live capture through PortAudio."""
+    def __init__(self, device_index=None):
+        self.device_index = device_index
+
+    def open(self, callback, blocksize, has_room=None):
+        if sd is None:
+            raise RuntimeError("No audio backend available (PortAudio could not be loaded).")
+        return sd.InputStream(device=self.device_index, channels=CHANNELS, samplerate=SAMPLE_RATE,
+                              callback=callback, blocksize=blocksize)
+
+class ReplaySource:
+    """Virtual microphone: plays a file into the recorder's callback, block by block.
+    speed is a multiple of real time (0 = as fast as the recorder keeps up). The stream clock follows the
+    audio, so capture times (and segment timestamps) are deterministic whatever the speed."""
+    def __init__(self, filepath, speed=1.0):
+        self.filepath = filepath
+        self.speed = speed
+        self.audio = None
+        self.finished = threading.Event() # Set once the whole file has been delivered
+
+    def open(self, callback, blocksize, has_room=None):
+        if self.audio is None:
+            self.audio = load_audio_file(self.filepath)
+        self.callback = callback
+        self.blocksize = blocksize
+        self.has_room = has_room # Lets unpaced replay wait for the consumer instead of overflowing
+        self.pos = 0
+        self.epoch = time.monotonic() # Arbitrary base, like PortAudio's stream time
+        self.running = False
+        self.thread = None
+        self.finished.clear()
+        return self
 
-    def flush(self):
-        if self.original_stderr:
-            self.original_stderr.flush()
+    @property
+    def time(self):
+        return self.epoch + self.pos / SAMPLE_RATE
 
     def start(self):
-        sys.stderr = self
+        self.running = True
+        self.thread = threading.Thread(target=self._play, daemon=True)
+        self.thread.start()
+
+    def _play(self):
+        started = time.monotonic()
+        while self.running and self.pos < len(self.audio):
+            block = self.audio[self.pos:self.pos + self.blocksize]
+            if self.speed > 0:
+                # A block is delivered once it would have been fully recorded
+                due = started + (self.pos + len(block)) / SAMPLE_RATE / self.speed
+                delay = due - time.monotonic()
+                if delay > 0: time.sleep(delay)
+            else:
+                while self.running and self.has_room and not self.has_room(len(block)):
+                    time.sleep(0.005)
+            time_info = SimpleNamespace(inputBufferAdcTime=self.time)
+            self.callback(block.reshape(-1, 1), len(block), time_info, None)
+            self.pos += len(block)
+        if self.pos >= len(self.audio):
+            self.finished.set()
 
     def stop(self):
-        sys.stderr = self.original_stderr
+        self.running = False
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def close(self):
+        pass
 
 class AudioRecorder:
+    VAD_MIN_CHUNK = 2.0 # Seconds before a pause is allowed to close a chunk
+    VAD_PAUSE = 0.6 # Seconds of silence that count as a pause
+    VAD_MIN_SPEECH = 0.3 # Chunks with less voiced audio than this are dropped
+    VAD_PREROLL = 0.3 # Silence kept in front of the first voiced frame
+    VAD_STEP = VoiceActivityDetector.FRAME * 10 # Samples analysed per segmenter step (300 ms)
+    BLOCK_SIZE = 4096
+    POLL_INTERVAL = 0.05
+
     def __init__(self):
         self.recording = False
         self.paused = False
         self.audio_queue = queue.Queue()
         self.stream = None
         self.device_index = None
-        self.audio_buffer = []
-        self.buffer_sample_count = 0
+        self.ring = None
         self.chunk_duration_samples = 0
-        self.lock = threading.Lock()
-
-    def start(self, device_index, chunk_duration):
-        logging.info(f"Starting recorder on device {device_index} with chunk {chunk_duration}s")
+        self.use_vad = False
+        self.overlap_samples = 0
+        self.vad = VoiceActivityDetector()
+        self.segmenter_thread = None
+        self.overflows = 0 # Incremented by the callback, reported by the segmenter
+        self.last_status = None
+        self.clock_offset = None # time.time() minus PortAudio stream time
+        self.anchors = [] # (ring position, wall-clock seconds) at every break in the sample stream
+        self.need_anchor = True
+
+    def start(self, device_index, chunk_duration, use_vad=False, overlap=0, source=None):
+        """source defaults to the microphone `device_index`; pass a ReplaySource to record from a file."""
+        source = source or MicrophoneSource(device_index)
+        logging.info(f"Starting recorder on {getattr(source, 'filepath', f'device {device_index}')} with chunk {chunk_duration}s (VAD: {use_vad}, overlap: {overlap}s)")
         self.device_index = device_index
         self.chunk_duration_samples = int(SAMPLE_RATE * chunk_duration)
-        self.audio_buffer = []
-        self.buffer_sample_count = 0
+        self.use_vad = use_vad
+        # Overlap must leave each chunk some new audio
+        self.overlap_samples = min(int(SAMPLE_RATE * overlap), self.chunk_duration_samples // 2)
+        self.vad = VoiceActivityDetector()
+        # Holds one open chunk plus plenty of slack for a slow segmenter step
+        # Sized for the longest chunk option, so auto-tune can change the length mid-session
+        longest = max(self.chunk_duration_samples, SAMPLE_RATE * max(CHUNK_OPTIONS.values()))
+        self.ring = AudioRingBuffer(longest + self.overlap_samples + SAMPLE_RATE * 10)
+        self.chunk_start = 0
+        self.overlap_end = 0 # Audio before this was already part of the previous chunk
+        self.analyzed = 0
+        self.speech_samples = 0
+        self.silence_run = 0
+        self.overflows = 0
+        self.anchors = []
+        self.need_anchor = True
         self.recording = True
         self.paused = False
+        self.segmenter_thread = threading.Thread(target=self._segmenter_loop, daemon=True)
+        self.segmenter_thread.start()
         try:
-            self.stream = sd.InputStream(
-                device=self.device_index,
-                channels=CHANNELS,
-                samplerate=SAMPLE_RATE,
-                callback=self.audio_callback,
-                blocksize=4096 
-            )
+            self.stream = source.open(self.audio_callback, self.BLOCK_SIZE, has_room=lambda n: self.ring.free() >= n)
+            try:
+                self.clock_offset = time.time() - self.stream.time
+            except Exception:
+                self.clock_offset = None
             self.stream.start()
             logging.info("Stream started successfully")
         except Exception as e:
             logging.error(f"Error starting stream: {e}")
+            self.recording = False
             raise
 
-    def audio_callback(self, indata, frames, time, status):
+    def audio_callback(self, indata, frames, time_info, status):
+        # Real-time thread: no locks, no logging. Just copy into the ring
+        # (plus a clock anchor when the stream restarts after a pause or a drop).
         if status:
-            logging.warning(f"Audio callback status: {status}")
+            self.overflows += 1
+            self.last_status = status
         if self.recording and not self.paused:
-            with self.lock:
-                self.audio_buffer.append(indata.copy())
-                self.buffer_sample_count += frames
-                
-                # Check if we have enough data for a full chunk
-                if self.buffer_sample_count >= self.chunk_duration_samples:
-                    # Combine buffered blocks
-                    full_data = np.concatenate(self.audio_buffer)
-                    
-                    # Extract chunk and remainder
-                    chunk = full_data[:self.chunk_duration_samples]
-                    remainder = full_data[self.chunk_duration_samples:]
-                    
-                    # Send the full chunk
-                    self.audio_queue.put(chunk)
-                    
-                    # Reset buffer with remainder
-                    self.audio_buffer = [remainder] if len(remainder) > 0 else []
-                    self.buffer_sample_count = len(remainder)
+            if self.need_anchor:
+                self.anchors.append((self.ring.write_pos, self._capture_clock(time_info, frames)))
+                self.need_anchor = False
+            if not self.ring.write(indata[:, 0]):
+                self.need_anchor = True
+
+    def _capture_clock(self, time_info, frames):
+        """Wall-clock time of this block's first sample: PortAudio's ADC time if the host API gives one."""
+        adc = getattr(time_info, "inputBufferAdcTime", 0) if time_info is not None else 0
+        if adc and self.clock_offset is not None:
+            return self.clock_offset + adc
+        return time.time() - frames / SAMPLE_RATE
+
+    def sample_time(self, pos):
+        """Wall-clock datetime at which ring position `pos` was captured."""
+        for anchor_pos, anchor_time in reversed(self.anchors):
+            if anchor_pos <= pos:
+                return datetime.datetime.fromtimestamp(anchor_time + (pos - anchor_pos) / SAMPLE_RATE)
+        return datetime.datetime.now()
+
+    def _segmenter_loop(self):
+        """Consumer side of the ring: cuts chunks and hands them to audio_queue."""
+        reported_overflows = 0
+        reported_dropped = 0
+        while True:
+            running = self.recording
+            if self.overflows != reported_overflows:
+                reported_overflows = self.overflows
+                logging.warning(f"Audio callback status: {self.last_status} ({reported_overflows} total)")
+            if self.ring.dropped != reported_dropped:
+                reported_dropped = self.ring.dropped
+                logging.warning(f"Ring buffer full, dropped {reported_dropped} samples so far")
+            
+            if self.use_vad:
+                self._segment_vad(self.ring.write_pos, final=not running)
+            else:
+                self._segment_fixed(self.ring.write_pos, final=not running)
+            
+            if not running: break
+            time.sleep(self.POLL_INTERVAL)
+
+    def _segment_fixed(self, end, final=False):
+        # Cut full chunks; the remainder stays in the ring for the next one
+        while end - self.chunk_start >= self.chunk_duration_samples:
+            cut = self.chunk_start + self.chunk_duration_samples
+            self._emit(cut, overlap=True)
+        
+        # Only transcribe a final partial chunk if there is significant new audio left (>0.1s)
+        if final and end - max(self.chunk_start, self.overlap_end) > int(SAMPLE_RATE * 0.1):
+            logging.info(f"Flushing final buffer: {end - self.chunk_start} samples")
+            self._emit(end)
+
+    def _segment_vad(self, end, final=False):
+        """Closes a chunk at the first pause after VAD_MIN_CHUNK, or at the chunk length at the latest."""
+        frame = VoiceActivityDetector.FRAME
+        while end - self.analyzed >= self.VAD_STEP or (final and end > self.analyzed):
+            step_end = min(self.analyzed + self.VAD_STEP, end)
+            voiced = self.vad.voiced_frames(np.concatenate(self.ring.views(self.analyzed, step_end)))
+            
+            if voiced.any():
+                last_voiced_end = (int(np.flatnonzero(voiced)[-1]) + 1) * frame
+                self.silence_run = max(0, (step_end - self.analyzed) - last_voiced_end)
+                self.speech_samples += int(voiced.sum()) * frame
+            else:
+                self.silence_run += step_end - self.analyzed
+            self.analyzed = step_end
+            
+            if self.speech_samples == 0:
+                # Nothing said yet: only keep a short pre-roll instead of accumulating silence
+                self.chunk_start = max(self.chunk_start, step_end - int(SAMPLE_RATE * self.VAD_PREROLL))
+                self.ring.release(self.chunk_start)
+                continue
+            
+            length = step_end - self.chunk_start
+            at_pause = (length >= int(SAMPLE_RATE * self.VAD_MIN_CHUNK)
+                        and self.silence_run >= int(SAMPLE_RATE * self.VAD_PAUSE))
+            if at_pause:
+                self._emit(step_end)
+            elif length >= self.chunk_duration_samples:
+                # Cut mid-speech: let the next chunk re-hear the boundary
+                self._emit(step_end, overlap=True)
+        
+        if final and self.speech_samples:
+            self._emit(end)
+
+    def _emit(self, cut, overlap=False):
+        """Copies [chunk_start, cut) out of the ring (once, off the audio thread) and queues it.
+        With overlap, the next chunk starts overlap_samples before the cut."""
+        if not self.use_vad or self.speech_samples >= int(SAMPLE_RATE * self.VAD_MIN_SPEECH):
+            lead = max(0, self.overlap_end - self.chunk_start) / SAMPLE_RATE
+            speech = self.speech_samples / SAMPLE_RATE if self.use_vad else None
+            # The newest sample in the ring was captured about now
+            now = time.monotonic()
+            newest = self.ring.write_pos
+            trace = {'capture_start': now - (newest - self.chunk_start) / SAMPLE_RATE,
+                     'capture_end': now - (newest - cut) / SAMPLE_RATE}
+            chunk = AudioChunk(self.ring.copy(self.chunk_start, cut), overlap=lead, speech=speech, trace=trace,
+                               capture_time=self.sample_time(self.chunk_start))
+            chunk.trace['enqueue'] = time.monotonic()
+            self.audio_queue.put(chunk)
+        else:
+            logging.debug(f"Dropping silent chunk ({cut - self.chunk_start} samples)")
+            overlap = False
+        self.chunk_start = cut - self.overlap_samples if overlap else cut
+        self.overlap_end = cut
+        self.analyzed = max(self.analyzed, cut)
+        self.speech_samples = 0
+        self.silence_run = 0
+        self.ring.release(self.chunk_start)
 
     def pause(self):
         self.paused = True
 
     def resume(self):
+        self.need_anchor = True
         self.paused = False
 
     def stop(self):
@@ -140,20 +1938,196 @@ class AudioRecorder:
             self.stream.close()
             self.stream = None
         
-        # Flush any remaining audio in the buffer
-        with self.lock:
-            if self.audio_buffer:
-                remaining_data = np.concatenate(self.audio_buffer)
-                # Only transcribe if there is significant audio left (>0.1s)
-                if len(remaining_data) > int(SAMPLE_RATE * 0.1):
-                    logging.info(f"Flushing final buffer: {len(remaining_data)} samples")
-                    self.audio_queue.put(remaining_data)
-                self.audio_buffer = []
-                self.buffer_sample_count = 0
+        # The segmenter flushes any remaining audio on its way out
+        if self.segmenter_thread:
+            self.segmenter_thread.join()
+            self.segmenter_thread = None
+
+class BatchJob:
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.duration = None
+        self.processed = 0.0
+        self.status = "Queued"
+
+class BatchWindow(ctk.CTkToplevel):
+    """Queue of files transcribed with the app's current model and formatting, one transcript each."""
+    ORDERS = ["Order: FIFO", "Order: Shortest First"]
+    CONCURRENCY = ["Jobs: 1", "Jobs: 2", "Jobs: 3", "Jobs: 4"]
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.app = app
+        self.title("Batch Transcription")
+        self.geometry("700x500")
+        self.jobs = []
+        self.rows = {}
+        self.running = False
+        self.started_at = None
+
+        top = ctk.CTkFrame(self, fg_color="transparent")
+        top.pack(fill="x", padx=10, pady=10)
+        self.add_files_btn = ctk.CTkButton(top, text="+ Files", width=80, command=self.add_files)
+        self.add_files_btn.pack(side="left", padx=5)
+        self.add_folder_btn = ctk.CTkButton(top, text="+ Folder", width=80, command=self.add_folder)
+        self.add_folder_btn.pack(side="left", padx=5)
+        self.order_menu = ctk.CTkOptionMenu(top, values=self.ORDERS, width=160)
+        self.order_menu.pack(side="left", padx=5)
+        self.jobs_menu = ctk.CTkOptionMenu(top, values=self.CONCURRENCY, width=90)
+        self.jobs_menu.pack(side="left", padx=5)
+        self.start_btn = ctk.CTkButton(top, text="▶ Start", fg_color="#00b894", hover_color="#55efc4", width=90, command=self.start)
+        self.start_btn.pack(side="right", padx=5)
+
+        self.list_frame = ctk.CTkScrollableFrame(self)
+        self.list_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        self.eta_label = ctk.CTkLabel(self, text="Add files to begin.", anchor="w", text_color="gray")
+        self.eta_label.pack(fill="x", padx=15, pady=(0, 10))
+
+    def add_files(self):
+        for path in filedialog.askopenfilenames(title="Select Audio/Video Files", filetypes=MEDIA_FILETYPES, parent=self):
+            self.add_job(path)
+
+    def add_folder(self):
+        folder = filedialog.askdirectory(parent=self)
+        if not folder: return
+        for name in sorted(os.listdir(folder)):
+            if name.lower().endswith(MEDIA_EXTENSIONS):
+                self.add_job(os.path.join(folder, name))
+
+    def add_job(self, path):
+        if self.running or any(job.path == path for job in self.jobs): return
+        job = BatchJob(path)
+        self.jobs.append(job)
+        row = ctk.CTkFrame(self.list_frame, fg_color="transparent")
+        row.pack(fill="x")
+        ctk.CTkLabel(row, text=job.name, anchor="w").pack(side="left", padx=5)
+        status = ctk.CTkLabel(row, text=job.status, anchor="e", text_color="gray")
+        status.pack(side="right", padx=5)
+        self.rows[job] = status
+        self.eta_label.configure(text=f"{len(self.jobs)} files queued.")
+
+    def update_start_state(self):
+        """UI thread: Start is only available while the app is idle (a live session owns the model and language)."""
+        idle = not self.running and not self.app.recorder.recording
+        self.start_btn.configure(state="normal" if idle else "disabled")
+
+    def start(self):
+        if self.running or not self.jobs or self.app.is_loading_model or self.app.recorder.recording: return
+        self.running = True
+        for w in (self.add_files_btn, self.add_folder_btn, self.order_menu, self.jobs_menu, self.start_btn):
+            w.configure(state="disabled")
+        self.app.lock_ui()
+        
+        # Snapshot everything the workers need from Tk before leaving the UI thread
+        options = {
+            'model': REVERSE_MODEL_MAP.get(self.app.model_combo.get(), "small"),
+            'proc': self.app.proc_combo.get(),
+            'order': self.order_menu.get(),
+            'concurrency': int(self.jobs_menu.get().split(": ")[1]),
+            'out_dir': self.app.save_directory(),
+            'ts_mode': self.app.time_fmt_var.get(),
+            'layout_mode': self.app.layout_var.get(),
+            'use_cache': self.app.cache_var.get(),
+            'language': LANGUAGE_OPTIONS.get(self.app.language_menu.get()),
+            'profile': FILE_PROFILE_OPTIONS.get(self.app.file_profile_menu.get(), "Balanced")
+        }
+        if self.app.save_mode_menu.get() == "Save: Ask":
+            options['out_dir'] = filedialog.askdirectory(title="Save transcripts to...", parent=self) or options['out_dir']
+        threading.Thread(target=self.run_batch, args=(options,), daemon=True).start()
+
+    def run_batch(self, options):
+        # The batch holds its own model reference, language and profile: app.model and app.language_lock
+        # belong to whatever the main window runs next
+        app = self.app
+        app.is_loading_model = True
+        checkpoint = device = None
+        try:
+            for job in self.jobs:
+                job.duration = probe_duration(job.path)
+            jobs = list(self.jobs)
+            if options['order'] == "Order: Shortest First":
+                jobs.sort(key=lambda j: j.duration if j.duration is not None else float("inf"))
+            
+            english_only = options['language'] == "en" and app.settings["english_models"]
+            options['params'] = app.file_decode_params(options['language'], english_only, options['profile'])
+            options['decode'] = app.file_decode_options(options['language'], options['profile'])
+            checkpoint = english_checkpoint(options['model']) if english_only else options['model']
+            device = resolve_device(options['proc'], app.hardware.data)
+            app.log_sys(f"Batch: using model '{checkpoint}' on {device.upper()}...")
+            # Loaded once, shared by every job
+            options['whisper'] = app.model_manager.acquire(checkpoint, device, progress=app.progress.publish)
+            self.started_at = time.monotonic()
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+                # Decoding overlaps across jobs; inference is serialized on app.inference_lock
+                list(pool.map(lambda job: self.run_job(job, options), jobs))
+            app.after(0, lambda: app.log_sys(f"Batch finished: {len(jobs)} files."))
+        except Exception as e:
+            logging.error(f"Batch failed: {e}")
+            msg = f"Batch Error: {e}" # e is unbound once the except block ends
+            app.after(0, lambda: app.log_sys(msg))
+        finally:
+            if options.get('whisper') is not None:
+                app.model_manager.release(checkpoint, device)
+            app.is_loading_model = False
+            self.running = False
+            app.after(0, app.reset_ui)
+
+    def run_job(self, job, options):
+        self.set_status(job, "Running")
+        try:
+            start_time = datetime.datetime.now()
+            cache = self.app.transcript_cache
+            cache_key = cache.key_for(job.path, options['model'], options['params']) if options['use_cache'] else None
+            cached = cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                source = self.app.iter_cached_segments(cached, job.duration, start_time=start_time)
+            else:
+                source = self.app.iter_file_segments(job.path, job.duration, options['whisper'], options['decode'],
+                                                     start_time=start_time)
+            
+            segments = []
+            for processed, batch in source:
+                segments.extend({'time': t, 'text': text} for text, t in batch)
+                job.processed = processed
+                self.set_status(job, f"{int(min(processed / job.duration, 1.0) * 100)}%" if job.duration else "Running")
+            
+            stem = os.path.splitext(job.name)[0]
+            path = os.path.join(options['out_dir'], f"{stem}_Transcript.txt")
+            self.app.write_transcript(path, segments, start_time, options['ts_mode'], options['layout_mode'])
+            if cache_key and cached is None:
+                cache.put(cache_key, [((seg['time'] - start_time).total_seconds(), seg['text']) for seg in segments])
+            job.processed = job.duration or job.processed
+            self.set_status(job, "Done")
+        except Exception as e:
+            logging.error(f"Batch job {job.name} failed: {e}")
+            self.set_status(job, "Failed")
+
+    def set_status(self, job, status):
+        job.status = status
+        self.app.after(0, self.refresh)
+
+    def refresh(self):
+        if not self.winfo_exists(): return
+        for job, label in self.rows.items():
+            color = {"Done": "#00b894", "Failed": "#d63031"}.get(job.status, "gray")
+            label.configure(text=job.status, text_color=color)
+        
+        # ETA from audio throughput so far, over the audio still left to do
+        done = sum(job.processed for job in self.jobs)
+        total = sum(job.duration or 0 for job in self.jobs)
+        finished = sum(1 for job in self.jobs if job.status in ("Done", "Failed"))
+        text = f"{finished}/{len(self.jobs)} files done"
+        if self.started_at and done > 0 and total > done:
+            rate = done / (time.monotonic() - self.started_at)
+            text += f"  |  ETA {datetime.timedelta(seconds=int((total - done) / rate))}"
+        self.eta_label.configure(text=text)
 
 class TranscriberApp(ctk.CTk):
-    def __init__(self):
+    def __init__(self, replay=None, startup_report=False):
         super().__init__()
+        self.replay = replay # ReplaySource standing in for the microphone, if any
+        self.startup_report = startup_report # Print startup timings as JSON and quit (for CI)
         
         self.title(f"Local Transcriber Pro {APP_VERSION}")
         self.geometry("1000x850")
@@ -163,6 +2137,26 @@ class TranscriberApp(ctk.CTk):
         self.recorder = AudioRecorder()
         self.model = None
         self.model_name = None
+        self.model_device = None
+        self.controller = None # RealtimeController while an auto-tuned live session runs
+        self.next_model_name = None # Model auto-tune is waiting to switch to
+        self.inference_lock = threading.Lock() # Whisper models are not safe for concurrent decodes
+        self.settings = load_settings()
+        self.transcript_cache = TranscriptCache(os.path.join(os.getcwd(), ".transcript_cache"),
+                                                self.settings["transcript_cache_mb"])
+        self.audio_cache = AudioCache(os.path.join(os.getcwd(), ".audio_cache"), self.settings["audio_cache_mb"])
+        metrics_file = self.settings["metrics_file"]
+        self.latency_stats = LatencyStats(os.path.join(os.getcwd(), metrics_file) if metrics_file else None)
+        self.diagnostics_window = None
+        self.inference_server = None
+        if self.settings["inference_process"]:
+            self.inference_server = InferenceServer()
+            self.inference_server.on_crash = lambda code: self.after(0, lambda: self.log_sys(
+                f"Speech engine crashed (exit code {code}); recording continues and it will restart."))
+        self.model_manager = ModelManager(self.settings["max_loaded_models"],
+                                          self.settings["model_memory_budget_mb"],
+                                          self.settings["model_idle_unload_minutes"],
+                                          loader=self.inference_server.load if self.inference_server else None)
         self.transcription_thread = None
         self.running = True
         
@@ -170,23 +2164,70 @@ class TranscriberApp(ctk.CTk):
         self.transcript_data = [] # List of dicts: {'time': datetime, 'text': str}
         self.session_start_time = None
         self.is_loading_model = False
-        self.backup_file = os.path.join(os.getcwd(), ".unsaved_session.json")
+        self.batch_window = None
+        self.pending_segments = [] # (text, time) pairs waiting for the UI thread
+        self.pending_traces = [] # Latency traces completed by the next flush
+        self.pending_lock = threading.Lock()
+        self.flush_scheduled = False
+        self.backup = BackupJournal(os.path.join(os.getcwd(), ".unsaved_session.jsonl"))
+        self.progress = ProgressBus(self.after) # Download/load/decode/transcribe progress from worker threads
+        self.progress.subscribe(self.on_progress)
+        self.progress_events = {} # Stage -> latest ProgressEvent of the current operation
+        self.language_lock = LanguageLock()
+        self.live_profile = self.settings["live_profile"] # DECODING_PROFILES names
+        self.file_profile = self.settings["file_profile"]
+        self.english_only = False # Load ".en" checkpoints (language known to be English)
+        self.model_checkpoint = None # Pool name of self.model, e.g. "small.en"
+        self.fast_model = None # Smaller model used while the live session is behind
+        self.fast_checkpoint = None
+        self.legacy_backup_file = os.path.join(os.getcwd(), ".unsaved_session.json")
+
+        # Filled in from the cached profile, then confirmed by background_init:
+        # torch/whisper and the hardware probe stay off the startup path
+        self.hardware = HardwareProfile(HARDWARE_PROFILE_FILE)
+        self.has_nvidia_gpu = False
+        self.torch_cuda_available = False
+        self.cuda_missing = False
+        self.mps_available = False
+        self.fix_cuda_btn = None
+        self.startup_times = {'module_import': _IMPORT_SECONDS}
 
-        self.check_hardware_status()
         self.setup_ui()
         self.setup_bindings()
+        if self.hardware.data: self.apply_hardware()
+        self.restore_model_choice()
         self.check_recovery()
         self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(0, self.on_first_window)
+
+    def on_first_window(self):
+        """Runs once the main loop has painted the window: now start the slow part of startup."""
+        self.startup_times['first_window'] = time.perf_counter() - _IMPORT_START
+        threading.Thread(target=self.background_init, daemon=True).start()
+
+    def background_init(self):
+        started = time.perf_counter()
+        ready = False
+        try:
+            import torch, whisper
+            self.startup_times['ml_import'] = time.perf_counter() - started
+            self.check_hardware_status()
+            self.startup_times['ready'] = time.perf_counter() - _IMPORT_START
+            ready = True
+        except Exception as e:
+            logging.error(f"Could not import torch/whisper: {e}")
+            msg = f"Error: could not load the speech engine ({e})."
+            self.after(0, lambda: self.log_sys(msg))
+        finally:
+            # Always report, so --startup-report exits even when the engine is broken
+            self.after(0, self.on_hardware_ready if ready else self.report_startup)
 
     def check_hardware_status(self):
-        self.has_nvidia_gpu = False
+        """Worker thread: re-probes only if torch or the GPU driver changed since the cached profile."""
         try:
-            subprocess.check_output("nvidia-smi", stderr=subprocess.STDOUT, shell=True)
-            self.has_nvidia_gpu = True
-        except: self.has_nvidia_gpu = False
-        self.torch_cuda_available = torch.cuda.is_available()
-        self.cuda_missing = self.has_nvidia_gpu and not self.torch_cuda_available
-        self.mps_available = hasattr(torch.backends, "mps") and torch.backends.mps.is_available()
+            self.hardware.refresh()
+        except Exception as e:
+            logging.error(f"Hardware probe failed: {e}")
 
     def setup_ui(self):
         self.grid_columnconfigure(0, weight=1)
@@ -223,21 +2264,11 @@ class TranscriberApp(ctk.CTk):
 
         ctk.CTkLabel(r1, text="Device:", font=("Roboto", 14)).pack(side="left", padx=(15, 5))
         
-        # Dynamic Device List
-        proc_values = ["Auto", "CPU"]
-        if self.torch_cuda_available:
-            proc_values.insert(1, "GPU (CUDA)")
-        if self.mps_available:
-            proc_values.insert(1, "GPU (MPS)")
-            
-        self.proc_combo = ctk.CTkComboBox(r1, values=proc_values, width=120, command=self.on_device_change)
+        # GPU entries are added by on_hardware_ready
+        self.proc_combo = ctk.CTkComboBox(r1, values=["Auto", "CPU"], width=120, command=self.on_device_change)
         self.proc_combo.set("Auto")
         self.proc_combo.pack(side="left", padx=5)
-
-        if self.cuda_missing:
-            self.fix_cuda_btn = ctk.CTkButton(r1, text="⚠️ GPU", fg_color="#e67e22", hover_color="#d35400", 
-                                          command=self.open_cuda_help, width=60)
-            self.fix_cuda_btn.pack(side="right", padx=10)
+        self.hardware_row = r1
 
         # Row 2: Formatting Options (New)
         r2 = ctk.CTkFrame(self.settings_frame, fg_color="transparent")
@@ -257,11 +2288,49 @@ class TranscriberApp(ctk.CTk):
                                              variable=self.layout_var, command=self.refresh_display, width=150)
         self.layout_menu.pack(side="left", padx=5)
 
+        # Pick model and context length from measured speed
+        self.adaptive_var = ctk.BooleanVar(value=False)
+        self.adaptive_chk = ctk.CTkCheckBox(r2, text="Auto-tune", variable=self.adaptive_var, font=("Roboto", 12))
+        self.adaptive_chk.pack(side="left", padx=15)
+
+        # Cut chunks at pauses instead of fixed lengths
+        self.vad_var = ctk.BooleanVar(value=True)
+        self.vad_chk = ctk.CTkCheckBox(r2, text="Cut at Pauses (VAD)", variable=self.vad_var, font=("Roboto", 12))
+        self.vad_chk.pack(side="left", padx=15)
+
+        self.overlap_menu = ctk.CTkOptionMenu(r2, values=list(OVERLAP_OPTIONS.keys()), width=120)
+        self.overlap_menu.set("Overlap: 1s")
+        self.overlap_menu.pack(side="left", padx=5)
+
+        # Spoken language: Auto detects once per session, then locks
+        self.language_menu = ctk.CTkOptionMenu(r2, values=list(LANGUAGE_OPTIONS.keys()), width=140)
+        self.language_menu.set(REVERSE_LANGUAGE_MAP.get(self.settings["language"], "Language: Auto"))
+        self.language_menu.pack(side="left", padx=5)
+
+        # Reuse earlier results for files already transcribed with the same settings
+        self.cache_var = ctk.BooleanVar(value=True)
+        self.cache_chk = ctk.CTkCheckBox(r2, text="Use Cache", variable=self.cache_var, font=("Roboto", 12))
+        self.cache_chk.pack(side="left", padx=15)
+
         # Open File Checkbox
         self.open_file_var = ctk.BooleanVar(value=True)
         self.open_file_chk = ctk.CTkCheckBox(r2, text="Open File", variable=self.open_file_var, font=("Roboto", 12))
         self.open_file_chk.pack(side="right", padx=10)
 
+        # Row 3: Decoding profiles, live and files separately
+        r3 = ctk.CTkFrame(self.settings_frame, fg_color="transparent")
+        r3.pack(fill="x", padx=10, pady=5)
+
+        ctk.CTkLabel(r3, text="Decoding:", font=("Roboto", 14, "bold")).pack(side="left", padx=5)
+
+        self.live_profile_menu = ctk.CTkOptionMenu(r3, values=list(LIVE_PROFILE_OPTIONS.keys()), width=150)
+        self.live_profile_menu.set(REVERSE_LIVE_PROFILE_MAP.get(self.settings["live_profile"], "Live: Balanced"))
+        self.live_profile_menu.pack(side="left", padx=5)
+
+        self.file_profile_menu = ctk.CTkOptionMenu(r3, values=list(FILE_PROFILE_OPTIONS.keys()), width=150)
+        self.file_profile_menu.set(REVERSE_FILE_PROFILE_MAP.get(self.settings["file_profile"], "Files: Balanced"))
+        self.file_profile_menu.pack(side="left", padx=5)
+
         # Loading
         self.load_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.load_frame.grid(row=3, column=0, sticky="ew", padx=20, pady=5)
@@ -281,7 +2350,7 @@ class TranscriberApp(ctk.CTk):
         self.controls_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.controls_frame.grid(row=5, column=0, sticky="ew", padx=20, pady=20)
         
-        self.hotkey_label = ctk.CTkLabel(self.controls_frame, text="Hotkeys: [F1] Record  |  [F2] Pause  |  [F3] Stop", 
+        self.hotkey_label = ctk.CTkLabel(self.controls_frame, text="Hotkeys: [F1] Record  |  [F2] Pause  |  [F3] Stop  |  [F4] Diagnostics", 
                                          font=("Consolas", 11), text_color="gray")
         self.hotkey_label.pack(side="top", pady=(0, 5))
 
@@ -301,6 +2370,9 @@ class TranscriberApp(ctk.CTk):
         self.file_btn = ctk.CTkButton(self.btn_inner, text="📁 Transcribe File", fg_color="#0984e3", hover_color="#74b9ff", width=160, height=40, font=("Roboto", 16, "bold"), command=self.transcribe_file)
         self.file_btn.pack(side="left", padx=15)
 
+        self.batch_btn = ctk.CTkButton(self.btn_inner, text="🗂 Batch", fg_color="#6c5ce7", hover_color="#a29bfe", width=110, height=40, font=("Roboto", 16, "bold"), command=self.open_batch)
+        self.batch_btn.pack(side="left", padx=15)
+
         # Save Mode
         self.save_mode_var = ctk.StringVar(value="Save: Desktop")
         self.save_mode_menu = ctk.CTkOptionMenu(self.btn_inner, values=["Save: Desktop", "Save: Custom...", "Save: Ask"],
@@ -311,12 +2383,133 @@ class TranscriberApp(ctk.CTk):
         self.status_bar = ctk.CTkLabel(self, text="Ready (Autosave: Desktop)", anchor="e", text_color="gray")
         self.status_bar.grid(row=6, column=0, sticky="ew", padx=25, pady=(0, 10))
 
+    def on_hardware_ready(self):
+        if self.hardware.data:
+            self.apply_hardware()
+            if not self.settings.get("last_model"): self.restore_model_choice() # First run: apply the recommended model
+        self.warm_start()
+        self.report_startup()
+
+    def apply_hardware(self):
+        data = self.hardware.data
+        self.has_nvidia_gpu = data["nvidia_gpu"]
+        self.torch_cuda_available = data["cuda"]
+        self.cuda_missing = self.has_nvidia_gpu and not self.torch_cuda_available
+        self.mps_available = data["mps"]
+
+        # Dynamic Device List
+        proc_values = ["Auto", "CPU"]
+        if self.torch_cuda_available:
+            proc_values.insert(1, "GPU (CUDA)")
+        if self.mps_available:
+            proc_values.insert(1, "GPU (MPS)")
+        self.proc_combo.configure(values=proc_values)
+
+        if self.cuda_missing and self.fix_cuda_btn is None:
+            self.fix_cuda_btn = ctk.CTkButton(self.hardware_row, text="⚠️ GPU", fg_color="#e67e22", hover_color="#d35400", 
+                                          command=self.open_cuda_help, width=60)
+            self.fix_cuda_btn.pack(side="right", padx=10)
+        elif not self.cuda_missing and self.fix_cuda_btn is not None:
+            self.fix_cuda_btn.destroy()
+            self.fix_cuda_btn = None
+
+    def report_startup(self):
+        times = self.startup_times
+        logging.info("Startup: " + ", ".join(f"{k} {v:.2f}s" for k, v in times.items()))
+        if 'ready' in times:
+            self.log_sys(f"Started in {times['first_window']:.1f}s (speech engine ready after {times['ready']:.1f}s).")
+        if self.startup_report:
+            print(json.dumps({k: round(v, 3) for k, v in times.items()}), flush=True)
+            self.on_close()
+
+    def restore_model_choice(self):
+        """Last-used model, or on first run the largest one the hardware profile says will keep up."""
+        last_model = self.settings.get("last_model")
+        if last_model in MODEL_SIZES:
+            self.model_combo.set(MODEL_SIZES[last_model])
+        elif self.hardware.data:
+            self.model_combo.set(MODEL_SIZES[self.hardware.recommended_model(self.settings["target_latency_seconds"])])
+
+    def warm_start(self):
+        """Start loading the last-used model in the background."""
+        last_model = self.settings.get("last_model")
+        if last_model in MODEL_SIZES:
+            if self.settings["language"] == "en" and self.settings["english_models"]:
+                last_model = english_checkpoint(last_model)
+            self.model_manager.preload(last_model, resolve_device(self.settings.get("last_device", "Auto"), self.hardware.data),
+                                       progress=self.progress.publish)
+
+    def use_model(self, model_name, proc_mode):
+        """Worker thread: make self.model the requested model, via the model pool."""
+        device = resolve_device(proc_mode, self.hardware.data)
+        checkpoint = self.checkpoint(model_name)
+        loaded = []
+        def on_load():
+            loaded.append(True)
+            self.after(0, lambda: self.loading_label.configure(text=f"Loading {checkpoint} on {device.upper()}..."))
+            self.log_sys(f"Loading model '{checkpoint}' on {device.upper()}...")
+        self.model = self.model_manager.acquire(checkpoint, device, on_load=on_load, progress=self.progress.publish)
+        if loaded: self.log_sys("Model loaded.")
+        self.model_name = model_name
+        self.model_checkpoint = checkpoint
+        self.model_device = device
+        self.settings["last_model"] = model_name
+        self.settings["last_device"] = proc_mode
+        save_settings(self.settings)
+
+    def done_with_model(self):
+        if self.model is not None:
+            self.model_manager.release(self.model_checkpoint, self.model_device)
+            self.model = None
+
+    def begin_language(self, language):
+        """Worker thread, at the start of a session or job: a fresh lock, pre-set if the user picked a language."""
+        self.language_lock = LanguageLock(language)
+        self.english_only = language == "en" and self.settings["english_models"]
+        self.settings["language"] = language
+
+    def begin_file_profile(self, profile):
+        """Worker thread, at the start of a file or batch: the decoding profile its windows use."""
+        self.file_profile = profile if profile in DECODING_PROFILES else "Balanced"
+        self.settings["file_profile"] = self.file_profile
+
+    def checkpoint(self, model_name):
+        """Pool name for a model size: its ".en" variant once the session is known to be English."""
+        return english_checkpoint(model_name) if self.english_only else model_name
+
+    def lock_language(self, model, chunk):
+        """Live: until the language is locked, run detection on well-voiced chunks."""
+        lock = self.language_lock
+        if lock.language or chunk.speech_seconds() < LanguageLock.MIN_SPEECH: return
+        try:
+            with self.inference_lock:
+                language, prob = detect_language(model, chunk.audio.flatten())
+        except Exception as e:
+            logging.warning(f"Language detection failed: {e}")
+            return
+        if not lock.observe(language, prob): return
+        name = REVERSE_LANGUAGE_MAP.get(language, language)
+        self.after(0, lambda: self.log_sys(f"Language locked to {name} ({prob:.0%} sure)."))
+        if language == "en" and self.settings["english_models"] and not self.english_only:
+            self.english_only = True
+            if english_checkpoint(self.model_name) != self.model_name:
+                # Swapped in by switch_live_model once loaded
+                self.model_manager.preload(self.checkpoint(self.next_model_name or self.model_name), self.model_device)
+                self.next_model_name = self.next_model_name or self.model_name
+
     def on_device_change(self, choice):
         if choice == "GPU (CUDA)" and not self.torch_cuda_available:
             messagebox.showwarning("Hardware Warning", "CUDA is not available.\nRunning in CPU mode.")
             self.proc_combo.set("CPU")
 
     def populate_devices(self):
+        if self.replay:
+            self.device_combo.configure(values=[f"Replay: {os.path.basename(self.replay.filepath)}"])
+            self.device_combo.set(f"Replay: {os.path.basename(self.replay.filepath)}")
+            return
+        if sd is None:
+            self.device_combo.set("No audio backend")
+            return
         devices = sd.query_devices()
         input_devices = []
         default_idx = sd.default.device[0]
@@ -331,10 +2524,11 @@ class TranscriberApp(ctk.CTk):
         elif input_devices: self.device_combo.set(input_devices[0])
 
     # --- Formatting Logic ---
-    def format_segment(self, segment):
-        """Format a single segment dict {'time': dt, 'text': str} based on current settings."""
-        ts_mode = self.time_fmt_var.get()
-        layout_mode = self.layout_var.get()
+    def format_segment(self, segment, ts_mode=None, layout_mode=None):
+        """Format a single segment dict {'time': dt, 'text': str} based on current settings.
+        Worker threads must pass the modes explicitly (Tk variables are UI-thread only)."""
+        ts_mode = ts_mode or self.time_fmt_var.get()
+        layout_mode = layout_mode or self.layout_var.get()
         
         ts_str = ""
         if ts_mode == "[HH:MM:SS]":
@@ -366,56 +2560,75 @@ class TranscriberApp(ctk.CTk):
         self.textbox.configure(state="disabled")
 
     def add_segment(self, text, custom_time=None):
-        if custom_time:
-            now = custom_time
-        else:
-            now = datetime.datetime.now()
-            
-        segment = {'time': now, 'text': text}
-        self.transcript_data.append(segment)
-        self.save_backup()
+        self.add_segments([(text, custom_time)])
+
+    def add_segments(self, batch):
+        """Append many (text, time) pairs with one textbox insert and one backup write."""
+        if not batch: return
+        now = datetime.datetime.now()
+        segments = [{'time': t if t else now, 'text': text} for text, t in batch]
+        self.transcript_data.extend(segments)
+        self.backup.extend(segments)
         
         # Efficient append to UI
-        formatted = self.format_segment(segment)
+        formatted = "".join(self.format_segment(seg) for seg in segments)
         self.textbox.configure(state="normal")
         self.textbox.insert("end", formatted)
         self.textbox.see("end")
         self.textbox.configure(state="disabled")
 
+    def post_segments(self, batch, trace=None):
+        """Thread-safe: queue results for the UI. Results arriving together are flushed as one batch.
+        A latency trace passed along is completed with its UI-insert time."""
+        with self.pending_lock:
+            self.pending_segments.extend(batch)
+            if trace is not None: self.pending_traces.append(trace)
+            if self.flush_scheduled: return
+            self.flush_scheduled = True
+        self.after(0, self._flush_pending)
+
+    def _flush_pending(self):
+        with self.pending_lock:
+            batch = self.pending_segments
+            traces = self.pending_traces
+            self.pending_segments = []
+            self.pending_traces = []
+            self.flush_scheduled = False
+        self.add_segments(batch)
+        now = time.monotonic()
+        for trace in traces:
+            trace['ui_insert'] = now
+            self.latency_stats.record(trace)
+
     # --- Backup & Recovery ---
     def check_recovery(self):
-        if os.path.exists(self.backup_file):
-            try:
-                with open(self.backup_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                
-                if data:
-                    # Convert isoformat string back to datetime
-                    for item in data:
-                        item['time'] = datetime.datetime.fromisoformat(item['time'])
-                    
-                    self.transcript_data = data
-                    self.refresh_display()
-                    self.log_sys("⚠️ RECOVERED UNSAVED SESSION")
-                    messagebox.showinfo("Recovered", "Unsaved session restored.")
-            except Exception as e:
-                logging.error(f"Recovery failed: {e}")
-
-    def save_backup(self):
         try:
-            # Serialize datetime
-            serializable_data = []
-            for item in self.transcript_data:
-                serializable_data.append({'time': item['time'].isoformat(), 'text': item['text']})
+            data, needs_compact = self.backup.replay()
+            
+            # Migrate sessions saved by older versions (single JSON snapshot)
+            legacy_file = None
+            if os.path.exists(self.legacy_backup_file):
+                with open(self.legacy_backup_file, "r", encoding="utf-8") as f:
+                    legacy = json.load(f)
+                for item in legacy:
+                    item['time'] = datetime.datetime.fromisoformat(item['time'])
+                data = legacy + data
+                needs_compact = True
+                legacy_file = self.legacy_backup_file
+            
+            if needs_compact:
+                self.backup.compact(data, supersedes=legacy_file)
             
-            with open(self.backup_file, "w", encoding="utf-8") as f:
-                json.dump(serializable_data, f)
-        except: pass
+            if data:
+                self.transcript_data = data
+                self.refresh_display()
+                self.log_sys("⚠️ RECOVERED UNSAVED SESSION")
+                messagebox.showinfo("Recovered", "Unsaved session restored.")
+        except Exception as e:
+            logging.error(f"Recovery failed: {e}")
 
     def clear_backup(self):
-        try:
-            if os.path.exists(self.backup_file): os.remove(self.backup_file)
-        except: pass
+        self.backup.reset()
 
     # --- File Transcription ---
     def transcribe_file(self):
@@ -423,7 +2636,7 @@ class TranscriberApp(ctk.CTk):
         
         filepath = filedialog.askopenfilename(
             title="Select Audio/Video File",
-            filetypes=[("Audio/Video Files", "*.wav *.mp3 *.m4a *.mp4 *.flac *.ogg *.mkv *.mov"), ("All Files", "*.*")]
+            filetypes=MEDIA_FILETYPES
         )
         
         if not filepath: return
@@ -433,79 +2646,102 @@ class TranscriberApp(ctk.CTk):
         current_model = REVERSE_MODEL_MAP.get(current_model_display, "small")
         current_chunk_label = self.chunk_combo.get()
         
+        if self.adaptive_var.get():
+            # Auto-tune: best model that should finish within the user's deadline
+            answer = ctk.CTkInputDialog(title="Deadline", text="Finish within how many minutes?\n(Leave empty for best quality)").get_input()
+            deadline = None
+            try:
+                deadline = float(answer) * 60 if answer and answer.strip() else None
+            except ValueError:
+                pass
+            duration = probe_duration(filepath) if deadline else None
+            if deadline and duration:
+                device = resolve_device(self.proc_combo.get(), self.hardware.data)
+                controller = RealtimeController(device, self.settings["call_seconds"], self.settings["target_latency_seconds"],
+                                                base_call=self.hardware.base_call_seconds(device))
+                model = controller.plan_file(duration, deadline)
+                self.log_sys(f"Auto-tune: '{model}' should finish in about {int(duration / 30 * controller.call_seconds(model) / 60) + 1} min.")
+            else:
+                model = "large"
+            self.model_combo.set(MODEL_SIZES[model])
         # Suggest upgrade if not already maximizing quality
         # We only suggest "Large" if the user isn't already using it.
-        if current_model != "large" or current_chunk_label != "30s (Best Context)":
+        elif current_model != "large" or current_chunk_label != "30s (Best Context)":
             if messagebox.askyesno("Quality Optimization", "For long files, best results are usually achieved with the 'Large' model and '30s' context.\n\nSwitch to these settings automatically?"):
                 self.model_combo.set(MODEL_SIZES["large"])
                 self.chunk_combo.set("30s (Best Context)")
         
         self.load_frame.grid()
         self.progress_bar.set(0)
+        self.progress_events.clear()
         self.loading_label.configure(text="Preparing file...")
         
         # Lock UI
+        self.lock_ui()
+        
+        proc_mode = self.proc_combo.get()
+        use_cache = self.cache_var.get()
+        language = LANGUAGE_OPTIONS.get(self.language_menu.get())
+        profile = FILE_PROFILE_OPTIONS.get(self.file_profile_menu.get(), "Balanced")
+        
+        threading.Thread(target=self.process_file, args=(filepath, proc_mode, use_cache, language, profile), daemon=True).start()
+
+    def open_batch(self):
+        if self.is_loading_model: return
+        if self.batch_window is not None and self.batch_window.winfo_exists():
+            self.batch_window.focus()
+            return
+        self.batch_window = BatchWindow(self)
+
+    def lock_ui(self):
         self.record_btn.configure(state="disabled")
         self.file_btn.configure(state="disabled")
+        self.batch_btn.configure(state="disabled")
         self.device_combo.configure(state="disabled")
         self.model_combo.configure(state="disabled")
-        
-        proc_mode = self.proc_combo.get()
-        
-        threading.Thread(target=self.process_file, args=(filepath, proc_mode), daemon=True).start()
 
-    def process_file(self, filepath, proc_mode):
+    def process_file(self, filepath, proc_mode, use_cache=True, language=None, profile="Balanced"):
         self.is_loading_model = True
-        self.redirector = StdErrRedirector(self.update_progress)
-        self.redirector.start()
-        
         try:
-            # 1. Load Model (Same logic as init_and_record)
+            self.begin_language(language)
+            self.begin_file_profile(profile)
             model_display_name = self.model_combo.get()
             model_name = REVERSE_MODEL_MAP.get(model_display_name, "small")
+            total = probe_duration(filepath)
+            workers = self.parallel_workers(model_name, resolve_device(proc_mode, self.hardware.data), total)
             
-            device = "cpu"
-            if proc_mode == "GPU (CUDA)": 
-                device = "cuda"
-            elif proc_mode == "GPU (MPS)": 
-                device = "mps"
-            elif proc_mode == "Auto": 
-                if torch.cuda.is_available():
-                    device = "cuda"
-                elif hasattr(torch.backends, "mps") and torch.backends.mps.is_available():
-                    device = "mps"
-                else:
-                    device = "cpu"
+            params = self.file_decode_params(self.language_lock.language, self.english_only, self.file_profile)
+            decode = self.file_decode_options(self.language_lock.language, self.file_profile)
+            cache_key = self.transcript_cache.key_for(filepath, model_name, params) if use_cache else None
+            cached = self.transcript_cache.get(cache_key) if cache_key else None
             
-            if self.model is None or self.model_name != model_name:
-                self.after(0, lambda: self.loading_label.configure(text=f"Loading {model_name} on {device.upper()}..."))
-                self.log_sys(f"Loading model '{model_name}' on {device.upper()}...")
-                self.model = whisper.load_model(model_name, device=device)
+            # 1. Load Model (parallel workers load their own, cache hits need none)
+            if cached is not None:
+                self.model_name = model_name
+                self.log_sys("Using cached transcript.")
+                segments = self.iter_cached_segments(cached, total)
+            elif workers > 1:
                 self.model_name = model_name
-                self.log_sys("Model loaded.")
+                segments = self.iter_file_segments_parallel(filepath, total, self.checkpoint(model_name), workers, decode)
+            else:
+                self.use_model(model_name, proc_mode)
+                segments = self.iter_file_segments(filepath, total, self.model, decode)
 
-            # 2. Transcribe
+            # 2. Transcribe window by window, publishing each window's segments as soon as it is done
             filename = os.path.basename(filepath)
             self.after(0, lambda: self.loading_label.configure(text=f"Transcribing {filename}..."))
             self.log_sys(f"Started processing file: {filename}")
             
             self.session_start_time = datetime.datetime.now()
             
-            # Whisper's transcribe method handles long files by splitting them internally.
-            # verbose=False prevents it from spamming stdout, but we lose the progress bar for the file itself.
-            # We can capture the result segments.
-            result = self.model.transcribe(filepath, verbose=False)
+            results = [] # (start_seconds, text) for the cache
+            for processed, batch in segments:
+                self.post_segments(batch)
+                self.progress.publish("transcribe", processed, total, filename)
+                results.extend(((t - self.session_start_time).total_seconds(), text) for text, t in batch)
             
-            # 3. Output Results
-            if result and "segments" in result:
-                # We append to current view.
-                
-                for segment in result["segments"]:
-                    text = segment["text"].strip()
-                    # Calculate segment start time relative to now
-                    seg_time = self.session_start_time + datetime.timedelta(seconds=segment['start'])
-                    
-                    self.after(0, lambda t=text, time=seg_time: self.add_segment(t, custom_time=time))
+            if cache_key and cached is None:
+                self.transcript_cache.put(cache_key, results)
             
             self.after(0, lambda: self.log_sys(f"Finished processing {filename}."))
             self.after(0, self.perform_save)
@@ -514,113 +2750,358 @@ class TranscriberApp(ctk.CTk):
             self.log_sys(f"File Error: {e}")
             messagebox.showerror("Error", f"Failed to process file:\n{e}")
         finally:
-            self.redirector.stop()
+            self.done_with_model()
             self.is_loading_model = False
             self.after(0, lambda: self.load_frame.grid_remove())
             self.after(0, self.reset_ui)
 
+    def iter_file_segments(self, filepath, total, model, options, start_time=None):
+        """Yields (processed_seconds, [(text, time), ...]) per decoded window. options: file_decode_options()."""
+        start_time = start_time or self.session_start_time
+        source = self.audio_cache.open(filepath, total, progress=self.progress.publish)
+        try:
+            for processed, batch in iter_window_segments(model, source, total, self.inference_lock, **options):
+                yield processed, [(text, start_time + datetime.timedelta(seconds=offset)) for offset, text in batch]
+        finally:
+            source.close()
+
+    def file_decode_params(self, language, english_only, profile):
+        """Everything besides audio and model that changes file-mode output (part of the cache key)."""
+        params = {'window': FILE_WINDOW_SECONDS}
+        if language: params['language'] = language
+        if english_only: params['english_only'] = True
+        params['profile'] = profile
+        return params
+
+    def file_decode_options(self, language, profile):
+        """transcribe() options for file windows: the file profile (with Whisper's own fallback) and the language."""
+        return dict(profile_options(DECODING_PROFILES[profile]), language=language)
+
+    def iter_cached_segments(self, cached, total, start_time=None):
+        start_time = start_time or self.session_start_time
+        yield total or 0, [(text, start_time + datetime.timedelta(seconds=start)) for start, text in cached]
+
+    def parallel_workers(self, model_name, device, total):
+        """How many worker processes to split a file across (1 = in-process)."""
+        if device != "cpu" or not self.settings["parallel_file_mode"]: return 1
+        if not total or total < PARALLEL_MIN_SECONDS: return 1
+        workers = self.settings["parallel_file_workers"] or max(1, (os.cpu_count() or 1) // 4)
+        # Every worker holds its own copy of the model
+        fit = self.settings["model_memory_budget_mb"] // MODEL_MEMORY_MB.get(model_name, 2000)
+        return max(1, min(workers, fit))
+
+    def iter_file_segments_parallel(self, filepath, total, model_name, workers, options):
+        """Like iter_file_segments, but spans split at silences are transcribed by worker processes.
+        Spans are yielded in timestamp order as soon as all earlier spans are done."""
+        silences = find_silences(filepath)
+        spans = plan_spans(total, silences, target=max(60, min(600, total / (workers * 4))))
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        pcm_path = self.audio_cache.lookup(filepath) # Workers slice it instead of running ffmpeg
+        self.log_sys(f"Parallel mode: {len(spans)} spans on {workers} workers x {threads} threads")
+        
+        ctx = multiprocessing.get_context("spawn") # Like InferenceServer: never fork the Tk/torch process
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_file_worker,
+                                 initargs=(model_name, threads, ctx.Lock())) as pool:
+            futures = [pool.submit(_transcribe_span, filepath, start, end, pcm_path, options)
+                       for start, end in spans]
+            for (start, end), future in zip(spans, futures):
+                batch = []
+                for seg_start, text in future.result():
+                    if text:
+                        batch.append((text, self.session_start_time + datetime.timedelta(seconds=start + seg_start)))
+                yield end, batch
+
+    def on_progress(self, event):
+        """UI thread: shows the most relevant running stage in the loading bar."""
+        self.progress_events[event.stage] = event
+        def running(e): return e.total is None or e.done < e.total
+        shown = event
+        for stage in ("download", "load", "transcribe", "decode"):
+            if stage in self.progress_events and running(self.progress_events[stage]):
+                shown = self.progress_events[stage]
+                break
+        self.progress_bar.set(min(shown.done / shown.total, 1.0) if shown.total else 0)
+        self.loading_label.configure(text=self.format_progress(shown))
+
+    def format_progress(self, event):
+        def fmt(secs): return str(datetime.timedelta(seconds=int(secs)))
+        pct = f" ({int(min(event.done / event.total, 1.0) * 100)}%)" if event.total else ""
+        if event.stage == "download":
+            size = f"{event.done / 2**20:.0f} / {event.total / 2**20:.0f} MB" if event.total else f"{event.done / 2**20:.0f} MB"
+            speed = f", {event.rate / 2**20:.1f} MB/s" if event.rate else ""
+            return f"Downloading {event.label}... {size}{pct}{speed}"
+        if event.stage == "load":
+            return f"Loading {event.label}..." if event.done < 1 else f"Loaded {event.label}."
+        verb = "Transcribing" if event.stage == "transcribe" else "Decoding"
+        done = f"{fmt(min(event.done, event.total))} / {fmt(event.total)}" if event.total else fmt(event.done)
+        speed = f", {event.rate:.1f}x real time" if event.rate else ""
+        return f"{verb} {event.label}... {done}{pct}{speed}"
+
     # --- Core Logic ---
     def start_recording(self):
         if self.is_loading_model: return
         self.load_frame.grid()
         self.progress_bar.set(0)
+        self.progress_events.clear()
         self.loading_label.configure(text="Initializing...")
         
-        dev_idx = int(self.device_combo.get().split(":")[0])
+        dev_idx = None if self.replay else int(self.device_combo.get().split(":")[0])
         model_name = REVERSE_MODEL_MAP.get(self.model_combo.get(), "small")
         chunk = CHUNK_OPTIONS.get(self.chunk_combo.get(), 10)
         proc = self.proc_combo.get()
+        use_vad = self.vad_var.get()
+        overlap = OVERLAP_OPTIONS.get(self.overlap_menu.get(), 0)
+        adaptive = self.adaptive_var.get()
+        language = LANGUAGE_OPTIONS.get(self.language_menu.get())
+        profile = LIVE_PROFILE_OPTIONS.get(self.live_profile_menu.get(), "Balanced")
         
         # Disable UI
-        self.record_btn.configure(state="disabled")
-        self.file_btn.configure(state="disabled")
-        self.device_combo.configure(state="disabled")
-        self.model_combo.configure(state="disabled")
+        self.lock_ui()
         
-        threading.Thread(target=self.init_and_record, args=(dev_idx, model_name, proc, chunk), daemon=True).start()
+        threading.Thread(target=self.init_and_record, args=(dev_idx, model_name, proc, chunk, use_vad, overlap, adaptive, language, profile), daemon=True).start()
 
-    def init_and_record(self, dev, model, proc, chunk):
+    def init_and_record(self, dev, model, proc, chunk, use_vad=False, overlap=0, adaptive=False, language=None, profile="Balanced"):
         self.is_loading_model = True
-        self.redirector = StdErrRedirector(self.update_progress)
-        self.redirector.start()
         try:
-            device = "cpu"
-            if proc == "GPU (CUDA)": 
-                device = "cuda"
-            elif proc == "GPU (MPS)": 
-                device = "mps"
-            elif proc == "Auto": 
-                if torch.cuda.is_available():
-                    device = "cuda"
-                elif hasattr(torch.backends, "mps") and torch.backends.mps.is_available():
-                    device = "mps"
-                else:
-                    device = "cpu"
-            
-            if self.model is None or self.model_name != model:
-                self.after(0, lambda: self.loading_label.configure(text=f"Loading {model} on {device}..."))
-                self.log_sys(f"Loading model '{model}' on {device.upper()}...")
-                self.model = whisper.load_model(model, device=device)
-                self.model_name = model
-                self.log_sys("Model loaded.")
+            self.begin_language(language)
+            self.live_profile = profile if profile in DECODING_PROFILES else "Balanced"
+            self.settings["live_profile"] = self.live_profile
+            self.controller = None
+            if adaptive:
+                device = resolve_device(proc, self.hardware.data)
+                self.controller = RealtimeController(device, self.settings["call_seconds"], self.settings["target_latency_seconds"],
+                                                     base_call=self.hardware.base_call_seconds(device))
+                model, chunk = self.controller.initial_plan()
+                self.after(0, lambda: self.show_live_choice(model, chunk))
+                self.log_sys(f"Auto-tune: starting with '{model}' at {chunk}s chunks.")
+            self.use_model(model, proc)
 
             self.session_start_time = datetime.datetime.now()
             
-            self.recorder.start(dev, chunk)
+            self.recorder.start(dev, chunk, use_vad, overlap, source=self.replay)
+            if self.replay:
+                threading.Thread(target=self.stop_after_replay, daemon=True).start()
             self.after(0, self.on_rec_start)
             self.transcription_thread = threading.Thread(target=self.process_queue, daemon=True)
             self.transcription_thread.start()
         except Exception as e:
             self.log_sys(f"Error: {e}")
+            self.done_with_model()
             self.after(0, self.reset_ui)
         finally:
-            self.redirector.stop()
             self.is_loading_model = False
             self.after(0, lambda: self.load_frame.grid_remove())
 
+    def stop_after_replay(self):
+        """Replay sessions end by themselves once the whole file has been played."""
+        self.replay.finished.wait()
+        self.after(0, lambda: self.stop_recording() if self.recorder.recording else None)
+
     def process_queue(self):
+        prev_words = [] # Tail of the last chunk's text, for overlap reconciliation
+        pending = [] # Chunks taken off the queue but not transcribed yet
+        finished = False
         while True:
-            data = self.recorder.audio_queue.get()
-            if data is None: break
+            if not pending and not finished:
+                chunk = self.recorder.audio_queue.get()
+                if chunk is None: finished = True
+                else:
+                    chunk.trace['dequeue'] = time.monotonic()
+                    pending.append(chunk)
+            # Take in everything else that is already waiting
+            while not finished:
+                try:
+                    chunk = self.recorder.audio_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if chunk is None: finished = True
+                else:
+                    chunk.trace['dequeue'] = time.monotonic()
+                    pending.append(chunk)
+            if not pending: break
+            
+            chunk, pending = self.apply_backlog_policy(pending)
+            if chunk is None: continue
+            self.switch_live_model()
+            model = self.live_model(behind=len(pending) > 0)
+            chunks, pending = self.next_batch(chunk, pending)
+            self.lock_language(model, chunk)
+            language = self.language_lock.language
+            profile = DECODING_PROFILES[self.live_profile]
             try:
-                fp16 = (self.model.device.type == "cuda")
-                res = self.model.transcribe(data.flatten(), fp16=fp16)
-                text = res["text"].strip()
-                if text:
-                    self.after(0, lambda t=text: self.add_segment(t))
+                if len(chunks) > 1:
+                    logging.info(f"Backlog: decoding {len(chunks)} chunks in one batch")
+                    # Batches decode once at temperature 0: there is no per-chunk fallback to budget
+                    results, prev_words, elapsed = transcribe_chunks(model, chunks, prev_words, self.inference_lock,
+                                                                     language=language, beam_size=profile["beam_size"])
+                else:
+                    budget = self.settings["live_budget_ratio"] * chunk.duration
+                    segments, prev_words, elapsed = transcribe_chunk(model, chunk, prev_words, self.inference_lock,
+                                                                     profile=profile, budget=budget, language=language)
+                    results = [segments]
+                    # Batches are not fed to auto-tune: their cost per chunk is not what a single call costs
+                    if self.controller and model is self.model:
+                        self.auto_tune(chunk.duration, elapsed)
+                for chunk, segments in zip(chunks, results):
+                    if segments:
+                        # Stamp each segment with when it was said, not when inference finished
+                        now = datetime.datetime.now()
+                        batch = [(text, chunk.time_at(start) or now + datetime.timedelta(seconds=start)) for start, text in segments]
+                        self.post_segments(batch, trace=chunk.trace)
+                    else:
+                        self.latency_stats.record(chunk.trace)
             except Exception as e:
                 logging.error(f"Transcribe fail: {e}")
         
+        self.report_lag(0)
+        self.release_fast_model()
+        self.next_model_name = None
+        if self.controller:
+            save_settings(self.settings) # Keep the measured call times for next session
+        self.done_with_model()
         self.after(0, self.perform_save)
         self.after(0, self.reset_ui)
 
+    def auto_tune(self, audio_seconds, elapsed):
+        """Feed one measurement to the controller and apply its model/chunk choice."""
+        rtf = self.controller.record(self.model_name, audio_seconds, elapsed)
+        model, chunk = self.controller.plan_live(self.model_name)
+        current_chunk = self.recorder.chunk_duration_samples // SAMPLE_RATE
+        if chunk != current_chunk:
+            logging.info(f"Auto-tune: RTF {rtf:.2f}, chunk {current_chunk}s -> {chunk}s")
+            self.recorder.chunk_duration_samples = int(SAMPLE_RATE * chunk) # The segmenter picks it up
+        if model != self.model_name and model != self.next_model_name:
+            logging.info(f"Auto-tune: RTF {rtf:.2f}, model {self.model_name} -> {model}")
+            self.next_model_name = model
+            self.model_manager.preload(self.checkpoint(model), self.model_device) # Switched to once loaded
+        self.after(0, lambda: self.show_live_choice(self.next_model_name or self.model_name, chunk))
+
+    def switch_live_model(self):
+        """Swap to the model auto-tune asked for, once the pool has it loaded."""
+        if not self.next_model_name: return
+        checkpoint = self.checkpoint(self.next_model_name)
+        model = self.model_manager.peek(checkpoint, self.model_device)
+        if model is None: return
+        self.release_fast_model()
+        self.model_manager.release(self.model_checkpoint, self.model_device)
+        self.model = model
+        self.model_name = self.next_model_name
+        self.model_checkpoint = checkpoint
+        self.next_model_name = None
+        self.after(0, lambda: self.log_sys(f"Now using '{checkpoint}'."))
+
+    def show_live_choice(self, model, chunk):
+        self.model_combo.set(MODEL_SIZES[model])
+        if chunk in REVERSE_CHUNK_MAP:
+            self.chunk_combo.set(REVERSE_CHUNK_MAP[chunk])
+
+    def apply_backlog_policy(self, pending):
+        """Picks what to transcribe next from the chunks waiting. Returns (chunk or None, rest)."""
+        lag = sum(c.duration for c in pending)
+        # Shown lag is measured on the capture clock: how long ago the oldest waiting audio ended
+        oldest = pending[0]
+        if len(pending) > 1 and oldest.capture_time:
+            captured_end = oldest.capture_time + datetime.timedelta(seconds=oldest.duration)
+            self.report_lag((datetime.datetime.now() - captured_end).total_seconds())
+        else:
+            self.report_lag(lag if len(pending) > 1 else 0)
+        policy = self.settings["backlog_policy"]
+        
+        # Hard cap: never fall further behind than max_backlog_seconds
+        dropped = 0.0
+        while len(pending) > 1 and lag > self.settings["max_backlog_seconds"]:
+            lag -= pending[0].duration
+            dropped += pending.pop(0).duration
+        if dropped:
+            self.after(0, lambda: self.log_sys(f"Behind real time: skipped {dropped:.0f}s of audio to catch up."))
+        
+        if len(pending) > 1 and policy == "skip_silence":
+            kept = [c for c in pending[:-1] if c.speech_seconds() >= SKIP_SPEECH_SECONDS] + pending[-1:]
+            if len(kept) < len(pending):
+                logging.info(f"Backlog: skipped {len(pending) - len(kept)} near-silent chunks")
+            pending = kept
+        
+        return self.next_group(pending)
+
+    def next_group(self, pending):
+        """Takes the next chunk to transcribe off `pending`: under the merge policy, as many waiting chunks
+        as fit in one Whisper window, joined. Returns (chunk, rest)."""
+        if len(pending) > 1 and self.settings["backlog_policy"] == "merge":
+            group = [pending[0]]
+            total = pending[0].duration
+            for c in pending[1:]:
+                total += c.duration - c.overlap
+                if total > MERGE_MAX_SECONDS: break
+                group.append(c)
+            if len(group) > 1:
+                logging.info(f"Backlog: merged {len(group)} chunks into one call")
+                return AudioChunk.merge(group), pending[len(group):]
+        return pending[0], pending[1:]
+
+    def next_batch(self, chunk, pending):
+        """While behind, more chunks to decode in the same batch as `chunk`. Returns (batch, rest)."""
+        batch = [chunk]
+        if not self.settings["batch_backlog"] or chunk.duration > BATCH_MAX_SECONDS:
+            return batch, pending
+        while pending and len(batch) < BATCH_MAX_CHUNKS:
+            nxt, rest = self.next_group(pending)
+            if nxt.duration > BATCH_MAX_SECONDS: break
+            batch.append(nxt)
+            pending = rest
+        return batch, pending
+
+    def live_model(self, behind):
+        """The model for the next live chunk: under the faster_model policy, one size down while behind."""
+        if self.settings["backlog_policy"] != "faster_model":
+            return self.model
+        names = list(MODEL_SIZES)
+        idx = names.index(self.model_name) if self.model_name in names else 0
+        if behind and idx > 0:
+            if self.fast_model is None:
+                self.fast_checkpoint = self.checkpoint(names[idx - 1])
+                self.fast_model = self.model_manager.peek(self.fast_checkpoint, self.model_device)
+                if self.fast_model is None:
+                    self.model_manager.preload(self.fast_checkpoint, self.model_device) # Use it once it is ready
+                else:
+                    logging.info(f"Backlog: switching to '{names[idx - 1]}' until caught up")
+            return self.fast_model or self.model
+        if not behind:
+            self.release_fast_model()
+        return self.model
+
+    def release_fast_model(self):
+        if self.fast_model is not None:
+            self.model_manager.release(self.fast_checkpoint, self.model_device)
+            self.fast_model = None
+
+    def report_lag(self, lag):
+        """Thread-safe: show how far live transcription is behind the microphone."""
+        def update():
+            if not self.recorder.recording or self.recorder.paused: return
+            if lag >= 1:
+                self.status_bar.configure(text=f"● Recording... (behind by {lag:.0f}s)")
+            else:
+                self.status_bar.configure(text="● Recording...")
+        self.after(0, update)
+
     def perform_save(self):
         if not self.transcript_data:
             self.log_sys("No text to save.")
             return
 
-        # Generate Full Text based on CURRENT settings
-        full_text = ""
-        for seg in self.transcript_data:
-            full_text += self.format_segment(seg)
-
         mode = self.save_mode_menu.get()
         fname = f"Transcript_{self.session_start_time.strftime('%Y-%m-%d_%H-%M-%S')}.txt"
         
         path = None
         if mode == "Save: Ask":
             path = filedialog.asksaveasfilename(defaultextension=".txt", initialfile=fname, filetypes=[("Text", "*.txt")])
-        elif mode == "Save: Custom..." and self.custom_save_path:
-            path = os.path.join(self.custom_save_path, fname)
         else:
-            path = os.path.join(os.environ['USERPROFILE'], 'Desktop', fname)
+            path = os.path.join(self.save_directory(), fname)
 
         if path:
             try:
-                with open(path, "w", encoding="utf-8") as f:
-                    f.write(f"SESSION: {self.session_start_time}\nMODEL: {self.model_name}\n")
-                    f.write("="*60 + "\n\n")
-                    f.write(full_text)
+                # Generate Full Text based on CURRENT settings
+                self.write_transcript(path, self.transcript_data, self.session_start_time)
                 self.log_sys(f"Saved: {path}")
                 
                 # Auto-open
@@ -638,11 +3119,24 @@ class TranscriberApp(ctk.CTk):
         else:
             self.log_sys("Save Cancelled. Data kept.")
 
+    def save_directory(self):
+        if self.save_mode_menu.get() == "Save: Custom..." and self.custom_save_path:
+            return self.custom_save_path
+        return os.path.join(os.environ['USERPROFILE'], 'Desktop')
+
+    def write_transcript(self, path, segments, session_start, ts_mode=None, layout_mode=None):
+        full_text = "".join(self.format_segment(seg, ts_mode, layout_mode) for seg in segments)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"SESSION: {session_start}\nMODEL: {self.model_name}\n")
+            f.write("="*60 + "\n\n")
+            f.write(full_text)
+
     def on_rec_start(self):
         self.pause_btn.configure(state="normal", fg_color="#e17055")
         self.stop_btn.configure(state="normal", fg_color="#d63031")
         self.status_bar.configure(text="● Recording...")
         self.log_sys("Session Started.")
+        self.update_batch_window()
 
     def log_sys(self, msg):
         self.textbox.configure(state="normal")
@@ -650,12 +3144,6 @@ class TranscriberApp(ctk.CTk):
         self.textbox.see("end")
         self.textbox.configure(state="disabled")
 
-    def update_progress(self, val):
-        self.after(0, lambda: self._update_progress_gui(val))
-    def _update_progress_gui(self, val):
-        self.progress_bar.set(val)
-        self.loading_label.configure(text=f"Downloading... {int(val*100)}%")
-
     def toggle_pause(self):
         if self.recorder.paused:
             self.recorder.resume()
@@ -674,11 +3162,17 @@ class TranscriberApp(ctk.CTk):
     def reset_ui(self):
         self.record_btn.configure(state="normal")
         self.file_btn.configure(state="normal")
+        self.batch_btn.configure(state="normal")
         self.pause_btn.configure(state="disabled", text="❚❚ Pause")
         self.stop_btn.configure(state="disabled")
         self.device_combo.configure(state="normal")
         self.model_combo.configure(state="normal")
         self.on_save_mode_change(self.save_mode_menu.get()) # Restore status bar text
+        self.update_batch_window()
+
+    def update_batch_window(self):
+        if self.batch_window is not None and self.batch_window.winfo_exists():
+            self.batch_window.update_start_state()
 
     def on_save_mode_change(self, choice):
         if choice == "Save: Custom...":
@@ -694,19 +3188,38 @@ class TranscriberApp(ctk.CTk):
         else:
             self.status_bar.configure(text="Ready (Ask on Stop)")
 
+    def open_diagnostics(self):
+        if self.diagnostics_window is not None and self.diagnostics_window.winfo_exists():
+            self.diagnostics_window.focus()
+            return
+        self.diagnostics_window = DiagnosticsWindow(self)
+
     def open_cuda_help(self): webbrowser.open("https://developer.nvidia.com/cuda-downloads")
     
     def setup_bindings(self):
         self.bind("<F1>", lambda e: self.start_recording())
         self.bind("<F2>", lambda e: self.toggle_pause())
         self.bind("<F3>", lambda e: self.stop_recording())
+        self.bind("<F4>", lambda e: self.open_diagnostics())
 
     def on_close(self):
         self.running = False
         if self.recorder.recording: self.recorder.stop()
+        self.backup.close()
+        if self.inference_server: self.inference_server.close()
         self.destroy()
         sys.exit()
 
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
 if __name__ == "__main__":
-    app = TranscriberApp()
+    multiprocessing.freeze_support() # Frozen builds re-launch this exe for worker processes
+    import argparse
+    parser = argparse.ArgumentParser(description="Local Transcriber Pro")
+    parser.add_argument("--replay", metavar="FILE", help="record from an audio file instead of the microphone")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed (multiple of real time, 0 = unpaced)")
+    parser.add_argument("--startup-report", action="store_true", help="print startup timings as JSON once ready, then quit")
+    args, _ = parser.parse_known_args()
+    app = TranscriberApp(replay=ReplaySource(args.replay, args.speed) if args.replay else None,
+                         startup_report=args.startup_report)
     app.mainloop()
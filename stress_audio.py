@@ -0,0 +1,40 @@
+"""Records from the default mic while a busy thread hogs the interpreter, then reports overflows.
+
+Usage: python stress_audio.py [seconds] [device_index]
+"""
+import sys
+import threading
+import time
+
+from local_transcriber import AudioRecorder
+
+def busy_loop(stop_event):
+    # Pure-Python work holds the GIL much like Whisper's decoding loop does
+    x = 0
+    while not stop_event.is_set():
+        for i in range(10000):
+            x += i * i
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 30
+    device = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    recorder = AudioRecorder()
+    stop_event = threading.Event()
+    workers = [threading.Thread(target=busy_loop, args=(stop_event,), daemon=True) for _ in range(2)]
+    for w in workers: w.start()
+
+    recorder.start(device, 10)
+    time.sleep(seconds)
+    recorder.stop()
+    stop_event.set()
+
+    chunks = recorder.audio_queue.qsize()
+    print(f"Block size:      {AudioRecorder.BLOCK_SIZE} frames")
+    print(f"Chunks produced: {chunks}")
+    print(f"Status warnings: {recorder.overflows} (last: {recorder.last_status})")
+    print(f"Dropped samples: {recorder.ring.dropped}")
+    sys.exit(1 if recorder.overflows or recorder.ring.dropped else 0)
+
+if __name__ == "__main__":
+    main()